@@ -0,0 +1,128 @@
+"""
+Throughput benchmarks of the conversion entry points.
+
+The classes follow the conventions of airspeed velocity (``asv``): ``params`` lists the array sizes,
+``setup`` builds the inputs and every ``time_*`` method is one benchmark. The module can also be run
+directly, without any benchmarking package, to print a table of timings::
+
+    python benchmarks/bench_conversions.py --max-size 1e6
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import timeit
+import astropy.units as u
+import astropy.constants as ac
+import numpy as np
+import unitconvert.natural as nat
+import unitconvert.planck as pl
+import unitconvert.gaussian as gau
+import unitconvert.geometrized as geo
+import unitconvert.gadget as gad
+from unitconvert.unitsystem import toSystem
+from unitconvert.custom import create_units, load_units
+
+SIZES = [1, 10**2, 10**4, 10**6, 10**8]
+
+
+class FixedSystems:
+    params = SIZES
+    param_names = ["size"]
+
+    def setup(self, size):
+        values = np.linspace(1.0, 2.0, size)
+        self.length = values * u.m
+        self.mass = values * u.kg
+        self.current = values * u.A
+        self.natural = nat.toNatural(self.length)
+        self.planck = pl.toPlanck(self.length)
+        self.gadget = gad.toGadget(values * u.pc)
+
+    def time_toNatural(self, size):
+        nat.toNatural(self.length)
+
+    def time_fromNatural(self, size):
+        nat.fromNatural(self.natural, u.m)
+
+    def time_toPlanck(self, size):
+        pl.toPlanck(self.length)
+
+    def time_fromPlanck(self, size):
+        pl.fromPlanck(self.planck, u.m)
+
+    def time_toGaussian(self, size):
+        gau.toGaussian(self.current)
+
+    def time_toGeometrized(self, size):
+        geo.toGeometrized(self.mass)
+
+    def time_toGadget(self, size):
+        gad.toGadget(self.length)
+
+    def time_fromGadget(self, size):
+        gad.fromGadget(self.gadget)
+
+    def time_toSystem(self, size):
+        toSystem(self.length, [u.kpc, u.solMass, u.yr])
+
+
+class CustomSystem:
+    params = SIZES
+    param_names = ["size"]
+
+    def setup(self, size):
+        self.cwd = os.getcwd()
+        self.tmp = tempfile.TemporaryDirectory()
+        os.chdir(self.tmp.name)
+        with contextlib.redirect_stdout(io.StringIO()):
+            create_units([ac.c, ac.hbar], [u.eV], save="local", name="bench", overwrite="yes")
+        self.convert, self.convertback, _, _ = load_units("bench", save="local")
+        self.length = np.linspace(1.0, 2.0, size) * u.m
+        self.custom = self.convert(self.length)
+
+    def teardown(self, size):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def time_create_units(self, size):
+        with contextlib.redirect_stdout(io.StringIO()):
+            create_units([ac.c, ac.hbar], [u.eV])
+
+    def time_load_units(self, size):
+        load_units("bench", save="local")
+
+    def time_convert(self, size):
+        self.convert(self.length)
+
+    def time_convertback(self, size):
+        self.convertback(self.custom, u.m)
+
+
+def run(suites, sizes, number):
+    print(f"{'benchmark':<40}{'size':>12}{'time [s]':>14}{'values/s':>14}")
+    for suite in suites:
+        names = sorted(name for name in dir(suite) if name.startswith("time_"))
+        for size in sizes:
+            bench = suite()
+            bench.setup(size)
+            try:
+                for name in names:
+                    method = getattr(bench, name)
+                    best = min(timeit.repeat(lambda: method(size), number=number, repeat=3)) / number
+                    label = f"{suite.__name__}.{name[5:]}"
+                    print(f"{label:<40}{size:>12}{best:>14.3e}{size / best:>14.3e}")
+            finally:
+                if hasattr(bench, "teardown"):
+                    bench.teardown(size)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--max-size", type=float, default=1e6, help="largest array size to benchmark")
+    parser.add_argument("--number", type=int, default=5, help="calls per timing")
+    args = parser.parse_args()
+    sizes = [size for size in SIZES if size <= args.max_size]
+    run([FixedSystems, CustomSystem], sizes, args.number)
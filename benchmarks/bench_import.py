@@ -0,0 +1,60 @@
+"""
+Start-up time of the package.
+
+The ``timeraw_*`` methods follow the conventions of airspeed velocity (``asv``), which runs the returned code
+in a fresh interpreter. The module can also be run directly to print the timings, the reference being the
+import of astropy that the package used to pay on start-up::
+
+    python benchmarks/bench_import.py
+"""
+
+import argparse
+import subprocess
+import sys
+import time
+
+STATEMENTS = {
+    "astropy (reference)": "import astropy.units, astropy.constants",
+    "unitconvert": "import unitconvert",
+    "unitconvert.natural": "import unitconvert.natural",
+    "unitconvert.custom": "import unitconvert.custom",
+    "unitconvert.constants": "from unitconvert.constants import c, hbar, G, k_B, eps0",
+    "first conversion": "import astropy.units as u, unitconvert.natural as n; n.toNatural(u.m)",
+}
+
+
+class Import:
+    def timeraw_astropy(self):
+        return STATEMENTS["astropy (reference)"]
+
+    def timeraw_unitconvert(self):
+        return STATEMENTS["unitconvert"]
+
+    def timeraw_natural(self):
+        return STATEMENTS["unitconvert.natural"]
+
+    def timeraw_custom(self):
+        return STATEMENTS["unitconvert.custom"]
+
+    def timeraw_constants(self):
+        return STATEMENTS["unitconvert.constants"]
+
+
+def timeit_fresh(statement, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", statement], check=True)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters per statement")
+    args = parser.parse_args()
+    empty = timeit_fresh("pass", args.repeat)
+    print(f"{'import':<24}{'time [s]':>12}")
+    for label, statement in STATEMENTS.items():
+        elapsed = max(timeit_fresh(statement, args.repeat) - empty, 0.0)
+        print(f"{label:<24}{elapsed:>12.4f}")
@@ -0,0 +1,102 @@
+"""
+Scaling of the conversions with the number of threads.
+
+Every thread converts its own array, so the total work grows with the number of threads. With conversions that
+hold the GIL the wall time would grow in proportion; the large-array multiplications run in NumPy ufuncs, which
+release it, so on a machine with enough cores the wall time stays nearly flat and the throughput grows linearly.
+The ``time_*`` methods follow the conventions of airspeed velocity (``asv``), and running the module directly
+prints the speedup over a single thread::
+
+    python benchmarks/bench_threads.py --size 1e7 --max-threads 8
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import timeit
+from concurrent.futures import ThreadPoolExecutor
+import astropy.units as u
+import astropy.constants as ac
+import numpy as np
+import unitconvert.natural as nat
+import unitconvert.gadget as gad
+from unitconvert.unitsystem import TargetSystem
+from unitconvert.custom import create_units, load_units
+
+SIZE = 10**7
+THREADS = [1, 2, 4, 8, 16]
+
+
+class Threaded:
+    params = THREADS
+    param_names = ["threads"]
+
+    def setup(self, threads, size=SIZE):
+        self.pool = ThreadPoolExecutor(threads)
+        self.lengths = [np.linspace(1.0, 2.0, size) * u.m for _ in range(threads)]
+        self.values = [np.linspace(1.0, 2.0, size) for _ in range(threads)]
+        self.out = [np.empty(size) for _ in range(threads)]
+        self.plan = nat.plan(u.m)
+        self.astro = TargetSystem([u.kpc, u.solMass, u.Gyr])
+        self.directory = tempfile.TemporaryDirectory()
+        cwd = os.getcwd()
+        os.chdir(self.directory.name)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                create_units([ac.c, ac.G], [u.kpc, u.K, u.A], save="local", name="bench")
+                self.custom = load_units("bench", save="local")[0]
+        finally:
+            os.chdir(cwd)
+
+    def teardown(self, threads, size=SIZE):
+        self.pool.shutdown()
+        self.directory.cleanup()
+
+    def map(self, func, *iterables):
+        list(self.pool.map(func, *iterables))
+
+    def time_toNatural(self, threads):
+        self.map(nat.toNatural, self.lengths)
+
+    def time_toGadget(self, threads):
+        self.map(gad.toGadget, self.lengths)
+
+    def time_toSystem(self, threads):
+        self.map(self.astro, self.lengths)
+
+    def time_custom(self, threads):
+        self.map(self.custom, self.lengths)
+
+    def time_apply_out(self, threads):
+        self.map(self.plan.apply, self.values, self.out)
+
+
+def run(threads, size, number):
+    names = sorted(name for name in dir(Threaded) if name.startswith("time_"))
+    print(f"{'benchmark':<28}{'threads':>8}{'time [s]':>12}{'values/s':>14}{'speedup':>10}")
+    for name in names:
+        single = None
+        for n in threads:
+            bench = Threaded()
+            bench.setup(n, size)
+            try:
+                method = getattr(bench, name)
+                method(n)
+                best = min(timeit.repeat(lambda: method(n), number=number, repeat=3)) / number
+            finally:
+                bench.teardown(n, size)
+            rate = n * size / best
+            single = single or rate
+            print(f"{name[5:]:<28}{n:>8}{best:>12.3e}{rate:>14.3e}{rate / single:>10.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=float, default=SIZE, help="array size converted by each thread")
+    parser.add_argument("--max-threads", type=int, default=os.cpu_count(), help="largest number of threads")
+    parser.add_argument("--number", type=int, default=3, help="calls per timing")
+    args = parser.parse_args()
+    threads = [n for n in THREADS if n <= args.max_threads] or [1]
+    run(threads, int(args.size), args.number)
@@ -0,0 +1,39 @@
+"""
+Conversion of astropy quantities between SI and other unit systems.
+The submodules are imported on first access, e.g. ``unitconvert.natural``, and astropy itself is only
+imported once a conversion is done, which keeps ``import unitconvert`` cheap.
+"""
+
+from importlib import import_module
+
+__all__ = [
+    "cli",
+    "compiler",
+    "constants",
+    "custom",
+    "daskarray",
+    "defaults",
+    "gadget",
+    "gaussian",
+    "geometrized",
+    "getdimensions",
+    "instrument",
+    "natural",
+    "parallel",
+    "plan",
+    "planck",
+    "service",
+    "snapshot",
+    "stream",
+    "unitsystem",
+]
+
+
+def __getattr__(name):
+    if name in __all__:
+        return import_module("unitconvert." + name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,24 @@
+from importlib import import_module
+
+
+class LazyModule:
+    """
+    Stand-in for the module `name` that imports it on first attribute access.
+    After the import the attributes of the module are copied onto the stand-in, so later lookups cost the same as on the module itself.
+    """
+
+    def __init__(self, name):
+        self.__dict__["_LazyModule__name"] = name
+
+    def __getattr__(self, attr):
+        module = import_module(self.__name)
+        self.__dict__.update(vars(module))
+        return getattr(module, attr)
+
+    def __repr__(self):
+        return f"<lazy module '{self.__name}'>"
+
+
+u = LazyModule("astropy.units")
+acon = LazyModule("astropy.constants")
+np = LazyModule("numpy")
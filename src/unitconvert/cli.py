@@ -0,0 +1,224 @@
+"""
+Convert the columns of CSV, `.npy` and HDF5 files to another unit system.
+
+Examples::
+
+    unitconvert particles.csv out.csv --to natural --unit x=m --unit t=s
+    unitconvert pos.npy pos_kpc.npy --to si:kpc,solMass,Gyr --unit m
+    unitconvert snap.h5 out.h5 --to gadget --unit PartType0/Coordinates=kpc
+    unitconvert data.csv out.csv --to custom:myunits --unit E=J
+"""
+
+import argparse
+import csv
+import sys
+from itertools import islice
+from os.path import basename, splitext
+from time import perf_counter
+from unitconvert._lazy import u, np
+from unitconvert.plan import get_planner
+
+#: Number of rows read, converted and written at once.
+ROWS = 2**16
+
+
+def parse_units(specs):
+    """
+    Parse `--unit` options of the form `column=unit`, or `unit` for all the columns.
+
+    Returns :
+            **(dictionary)** : the astropy unit of each column, with the key None for the default unit
+    """
+    units = {}
+    for spec in specs:
+        column, sep, unit = spec.rpartition("=")
+        units[column if sep else None] = u.Unit(unit)
+    return units
+
+
+def target_planner(target):
+    """
+    Find the planner of the target system given on the command line: a built-in system, `custom:<name>`,
+    or `si:<unit>,<unit>,...` for a set of SI-like units, see :class:`unitconvert.unitsystem.TargetSystem`
+    """
+    if target.startswith("si:"):
+        from unitconvert.unitsystem import TargetSystem
+
+        return TargetSystem(u.Unit(unit) for unit in target[len("si:") :].split(",")).plan
+    return get_planner(target)
+
+
+class Converter:
+    """
+    Convert the columns of a file chunk by chunk, keeping the plan of each column and the number of converted rows
+    """
+
+    def __init__(self, planner, units):
+        self.planner = planner
+        self.units = units
+        self.plans = {}
+        self.rows = 0
+
+    def plan(self, column):
+        """
+        The plan of `column`, or None when the column has no unit and is copied unchanged
+        """
+        if column not in self.plans:
+            unit = self.units.get(column, self.units.get(None))
+            self.plans[column] = None if unit is None else self.planner(unit)
+        return self.plans[column]
+
+    def targets(self):
+        """
+        The unit of each converted column
+        """
+        return {column: plan.target for column, plan in self.plans.items() if plan is not None}
+
+
+def convert_csv(src, dst, converter, chunksize=ROWS, delimiter=","):
+    """
+    Convert the columns of the CSV file `src`, whose first row holds the column names, and write them to `dst`
+    """
+    with open(src, newline="") as fin, open(dst, "w", newline="") as fout:
+        reader = csv.reader(fin, delimiter=delimiter)
+        writer = csv.writer(fout, delimiter=delimiter)
+        header = next(reader)
+        writer.writerow(header)
+        plans = [converter.plan(column) for column in header]
+        while True:
+            rows = list(islice(reader, chunksize))
+            if not rows:
+                break
+            columns = list(zip(*rows))
+            for i, plan in enumerate(plans):
+                if plan is not None:
+                    columns[i] = plan.apply(np.asarray(columns[i], dtype=float)).tolist()
+            writer.writerows(zip(*columns))
+            converter.rows += len(rows)
+
+
+def convert_npy(src, dst, converter, chunksize=ROWS):
+    """
+    Convert the `.npy` file `src` to `dst` through memory maps. The columns of structured arrays are its fields,
+    other arrays are a single column named after the file.
+    """
+    inp = np.load(src, mmap_mode="r")
+    names = inp.dtype.names
+    if names is None:
+        plans = {None: converter.plan(splitext(basename(src))[0])}
+        dtype = np.float64 if plans[None] is not None else inp.dtype
+    else:
+        plans = {name: converter.plan(name) for name in names}
+        dtype = [
+            (name, inp.dtype[name] if plans[name] is None else np.float64) for name in names
+        ]
+    out = np.lib.format.open_memmap(dst, mode="w+", dtype=dtype, shape=inp.shape)
+    for start in range(0, len(inp), chunksize):
+        stop = start + chunksize
+        for name, plan in plans.items():
+            a = inp[start:stop] if name is None else inp[name][start:stop]
+            b = out[start:stop] if name is None else out[name][start:stop]
+            if plan is None:
+                b[...] = a
+            else:
+                plan.apply(a, out=b)
+        converter.rows += len(inp[start:stop])
+    out.flush()
+
+
+def convert_hdf5(src, dst, converter, chunksize=ROWS):
+    """
+    Convert the datasets of the HDF5 file `src` and write them to `dst` with their groups and attributes.
+    A dataset is converted when a unit is given for its path, stored in its `unit` attribute, or given for all the columns.
+    Its `unit` attribute is then set to the target unit. Requires `h5py`.
+    """
+    try:
+        import h5py
+    except ImportError as err:
+        raise ImportError("Reading HDF5 files requires h5py") from err
+
+    with h5py.File(src, "r") as fin, h5py.File(dst, "w") as fout:
+        fout.attrs.update(fin.attrs)
+
+        def copy(name, obj):
+            if isinstance(obj, h5py.Group):
+                fout.require_group(name).attrs.update(obj.attrs)
+                return
+            if name not in converter.units and "unit" in obj.attrs:
+                converter.units[name] = u.Unit(obj.attrs["unit"])
+            plan = converter.plan(name)
+            dtype = obj.dtype if plan is None else np.float64
+            out = fout.create_dataset(name, shape=obj.shape, dtype=dtype)
+            out.attrs.update(obj.attrs)
+            if plan is not None:
+                out.attrs["unit"] = plan.target.to_string()
+            if obj.ndim == 0:
+                out[()] = obj[()] if plan is None else plan.apply(obj[()])
+                return
+            for start in range(0, len(obj), chunksize):
+                chunk = obj[start : start + chunksize]
+                out[start : start + len(chunk)] = chunk if plan is None else plan.apply(chunk)
+                converter.rows += len(chunk)
+
+        fin.visititems(copy)
+
+
+FORMATS = {
+    ".csv": convert_csv,
+    ".txt": convert_csv,
+    ".npy": convert_npy,
+    ".h5": convert_hdf5,
+    ".hdf5": convert_hdf5,
+}
+
+
+def main(argv=None):
+    """
+    Entry point of the `unitconvert` command
+    """
+    parser = argparse.ArgumentParser(
+        prog="unitconvert",
+        description=__doc__.strip().splitlines()[0],
+        epilog=__doc__.split("\n\n", 1)[1],
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("input", help="the CSV, .npy or HDF5 file to convert")
+    parser.add_argument("output", help="the converted file, of the same format")
+    parser.add_argument(
+        "--to",
+        required=True,
+        help="natural, planck, gaussian, geometrized, gadget, custom:<name> or si:<unit>,<unit>,...",
+    )
+    parser.add_argument(
+        "--unit",
+        action="append",
+        default=[],
+        metavar="[COLUMN=]UNIT",
+        help="the unit of a column, or of all the columns when no name is given. Columns without a unit are copied",
+    )
+    parser.add_argument("--chunksize", type=int, default=ROWS, help="rows converted at once")
+    parser.add_argument("--delimiter", default=",", help="the delimiter of CSV files")
+    args = parser.parse_args(argv)
+
+    ext = splitext(args.input)[1].lower()
+    if ext not in FORMATS:
+        parser.error(f"unsupported file type '{ext}', expected one of {', '.join(FORMATS)}")
+    try:
+        converter = Converter(target_planner(args.to), parse_units(args.unit))
+    except (ValueError, TypeError, OSError) as err:
+        parser.error(str(err))
+    kwargs = {"delimiter": args.delimiter} if FORMATS[ext] is convert_csv else {}
+
+    start = perf_counter()
+    FORMATS[ext](args.input, args.output, converter, chunksize=args.chunksize, **kwargs)
+    elapsed = perf_counter() - start
+
+    for column, target in converter.targets().items():
+        print(f"{column or args.input}: {target}")
+    rate = converter.rows / elapsed if elapsed > 0 else float("inf")
+    print(f"Converted {converter.rows} rows in {elapsed:.3f} s ({rate:.3e} rows/s)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
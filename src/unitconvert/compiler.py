@@ -0,0 +1,192 @@
+import math
+from functools import cached_property, lru_cache
+from math import pi
+from unitconvert._lazy import u, acon
+from unitconvert import defaults
+from unitconvert.getdimensions import NCORE, dimension_solver, dimsignature
+from unitconvert.plan import PLAN_CACHE_SIZE, ConversionPlan
+from unitconvert.rational import power
+
+
+def _constant(spec):
+    if callable(spec):
+        return spec()
+    if isinstance(spec, str):
+        return getattr(acon, spec)
+    return spec
+
+
+def _unit(spec):
+    if isinstance(spec, str):
+        return u.Unit(spec)
+    return spec
+
+
+class CompiledSystem:
+    """
+    A unit system declared by the constants that are set to 1 and the units in which the remaining dimensions are expressed.
+    The dimension algebra is solved exactly once, and the conversion of each input unit is compiled into a cached
+    :class:`unitconvert.plan.ConversionPlan`, so converting arrays costs a single multiplication.
+    Nothing is computed, and astropy is not imported, until the first conversion.
+    A system can be used by several threads at once: its plans live in an `lru_cache`, which stays consistent under
+    concurrent calls, and at worst compiles a plan twice when two threads meet a new unit together.
+
+    Args :
+            **name (str)** : the name of the unit system
+
+            **constants (dict)** : the constants set to 1, keyed by the label used by :meth:`factor`. Each is an astropy
+            quantity, the name of a constant of `astropy.constants`, or a function returning a quantity
+
+            **units (list)** : astropy units or unit strings for the dimensions not fixed by the constants.
+            Together with `constants` they must span mass, length, time, temperature and current.
+
+            **finish (function)** : optional function applied to the converted quantities, for instance to express them in cgs units
+
+    Example :
+            >>> from unitconvert.compiler import CompiledSystem
+            >>> from astropy import units as u
+            >>> hl = CompiledSystem("Heaviside-Lorentz", {"hbar": "hbar", "c": "c", "k_B": "k_B", "eps0": "eps0"}, ["GeV"])
+            >>> hl.convert(1 * u.fm)
+            <Quantity 5.06773072 1 / GeV>
+            >>> hl.factor(u.fm)
+            {'hbar': 1.0, 'c': 1.0, 'k_B': 0.0, 'eps0': 0.0}
+    """
+
+    def __init__(self, name, constants, units=(), finish=None):
+        if len(constants) + len(units) != NCORE:
+            raise ValueError(
+                f"{name}: {len(constants)} constants and {len(units)} units given, they must add up to {NCORE}"
+            )
+        self.name = name
+        self.labels = list(constants)
+        self.__specs = list(constants.values())
+        self.__unitspecs = list(units)
+        self.__finish = finish
+        self.__solve = dimension_solver(lambda: self.constants + self.units)
+        self.__plan = lru_cache(maxsize=PLAN_CACHE_SIZE)(self.__compile)
+
+    @cached_property
+    def constants(self):
+        """
+        The constants set to 1, as astropy quantities
+        """
+        return [_constant(i) for i in self.__specs]
+
+    @cached_property
+    def units(self):
+        """
+        The units of the dimensions not fixed by the constants
+        """
+        return [_unit(i) for i in self.__unitspecs]
+
+    def __repr__(self):
+        return f"<CompiledSystem {self.name}: {', '.join(self.labels)} = 1>"
+
+    def exponents(self, q):
+        """
+        Find the exact exponents of the constants, followed by those of the units, whose product has the dimensions of `q`.
+
+        Returns :
+            **(tuple)** : the exponents as :class:`fractions.Fraction`
+        """
+        return self.__solve(dimsignature(q)[0])
+
+    def factor(self, q):
+        """
+        Find the conversion factor of `q` in terms of the constants set to 1.
+
+        Returns :
+            **(dictionary)** : the exponent of each constant, keyed by its label
+        """
+        x = self.exponents(q)
+        return {label: float(x[i]) for i, label in enumerate(self.labels)}
+
+    def __compile(self, unit):
+        dims, _ = dimsignature(unit)
+        x = self.__solve(dims)
+        nc = len(self.labels)
+        factor = math.prod(power(c, x[i]) for i, c in enumerate(self.constants))
+        target = u.dimensionless_unscaled
+        for i, base in enumerate(self.units):
+            target = target * power(base, x[nc + i])
+        for base, p in zip(defaults.si[NCORE:], dims[NCORE:]):
+            target = target * power(base, p)
+        converted = ((1.0 * unit).si / factor).to(target)
+        if self.__finish is not None:
+            converted = self.__finish(converted)
+        return ConversionPlan(unit, float(converted.value), converted.unit)
+
+    def plan(self, unit):
+        """
+        Compile the conversion of values given in `unit` to this unit system. Plans are cached per input unit.
+
+        Returns :
+            **(ConversionPlan)** : a callable converting values or quantities given in `unit`
+        """
+        return self.__plan(u.Unit(unit))
+
+    def plan_cache_info(self):
+        """
+        Hit/miss statistics of the plans cached by :meth:`plan`
+        """
+        return self.__plan.cache_info()
+
+    def convert(self, q, inplace=False):
+        """
+        Convert the astropy quantity or unit `q` from SI to this unit system.
+        A :class:`unitconvert.daskarray.LazyQuantity` is converted lazily.
+        With `inplace=True` the buffer of `q` is rescaled instead of copied.
+        """
+        if isinstance(q, u.UnitBase):
+            q = 1.0 * q
+        return self.plan(q.unit)(q, inplace=inplace)
+
+    def convert_values(self, values, unit, out=None):
+        """
+        Convert raw `values` given in `unit` to this unit system, optionally writing into the array `out`
+        """
+        return self.plan(unit).apply(values, out=out)
+
+    def convertback(self, q, finalUnits, inplace=False):
+        """
+        Convert the astropy quantity `q` from this unit system to `finalUnits`, which must have the dimensions `q` had in SI.
+        With `inplace=True` the buffer of `q` is rescaled instead of copied.
+        """
+        if isinstance(q, u.UnitBase):
+            q = 1.0 * q
+        return self.reverse_converter(finalUnits)(q, inplace=inplace)
+
+    def reverse_converter(self, finalUnits):
+        """
+        Compile the conversion from this unit system to `finalUnits` once, for repeated use.
+
+        Returns :
+            **(ConversionPlan)** : a callable converting quantities, or raw values expressed in its input unit, to `finalUnits`.
+            It raises `astropy.units.UnitConversionError` for quantities of other dimensions.
+        """
+        return self.plan(finalUnits).inverse()
+
+
+#: Stoney units, where :math:`c = G = e = k_B = 1/(4\pi\epsilon_0) = 1`
+STONEY = CompiledSystem(
+    "Stoney",
+    {
+        "c": "c",
+        "G": "G",
+        "e": lambda: acon.e.si,
+        "k_B": "k_B",
+        "k_e": lambda: 1 / (4 * pi * acon.eps0),
+    },
+)
+
+#: Hartree atomic units, where :math:`\hbar = m_e = e = 1/(4\pi\epsilon_0) = 1` and temperatures stay in kelvin
+ATOMIC = CompiledSystem(
+    "atomic",
+    {
+        "hbar": "hbar",
+        "m_e": "m_e",
+        "e": lambda: acon.e.si,
+        "k_e": lambda: 1 / (4 * pi * acon.eps0),
+    },
+    ["K"],
+)
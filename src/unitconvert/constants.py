@@ -0,0 +1,15 @@
+"""
+Values in SI units of the physical constants used by the unit systems, as given by CODATA 2022.
+They are available without importing astropy, for code that only needs the numbers.
+"""
+
+#: Speed of light in vacuum [m / s]
+c = 299792458.0
+#: Reduced Planck constant [J s]
+hbar = 1.0545718176461565e-34
+#: Newtonian constant of gravitation [m3 / (kg s2)]
+G = 6.6743e-11
+#: Boltzmann constant [J / K]
+k_B = 1.380649e-23
+#: Vacuum electric permittivity [F / m]
+eps0 = 8.8541878188e-12
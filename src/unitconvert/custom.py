@@ -1,14 +1,37 @@
-import astropy.units as u
-import astropy.constants as acon
-from unitconvert.getdimensions import getdim
-import numpy as np
+from __future__ import annotations
+from unitconvert._lazy import u, acon, np
+from unitconvert.instrument import instrumented, register_cache
+from unitconvert.getdimensions import getdim, dimsignature
 import math
-from unitconvert.defaults import si
-
-
-def create_units(constants, units, save=None, name=None, overwrite="no", labels=[]):
+import threading
+from collections import namedtuple
+from functools import lru_cache
+from unitconvert import defaults
+from unitconvert.daskarray import LazyQuantity
+from unitconvert.plan import cached_planner, convert_columns, rescale_inplace
+from unitconvert.rational import SingularMatrixError, inverse, power
+
+#: Maximum number of units for which each custom system keeps its conversion factor.
+FACTOR_CACHE_SIZE = 256
+#: Version of the `.unit_<name>.npz` format written by :func:`create_units`.
+FORMAT_VERSION = 1
+
+#: Hits and misses of the lookup table of a :class:`UnitSystem`, as returned by :meth:`UnitSystem.cache_info`.
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+# Converters built by load_units, keyed by (name, directory, modification time of the file)
+_registry = {}
+# Held while the registry is read or changed, so that threads loading the same system get the same functions
+_registry_lock = threading.RLock()
+
+
+@instrumented
+def create_units(
+    constants, units, save=None, name=None, overwrite="no", labels=[], verbose=True
+):
     """
     Creates a new unit system and saves them in current working directory or inside a global directory.
+    Saved systems are stored in a versioned `.unit_<name>.npz` file holding the exact transformation matrix and constant values.
     This saved system can be accessed later. The target custom unit system has two parts.
     1) List of constants or units that needs to be set to 1
     2) List of Remaining units
@@ -28,6 +51,8 @@ def create_units(constants, units, save=None, name=None, overwrite="no", labels=
             a symbol for that constant. It is useful when one uses not the inbuilt astropy constants but
             defines ones own constants.
 
+            **verbose (bool)** : `False` to not print the details of the unit system
+
     Returns :
             None
     """
@@ -37,7 +62,7 @@ def create_units(constants, units, save=None, name=None, overwrite="no", labels=
     from os.path import exists as isthere
 
     targetunits = constants + units
-    unitsysdetails = checksystem(targetunits)
+    unitsysdetails = checksystem(targetunits, verbose=verbose)
     unused = unitsysdetails["SI-unrelated"]
     units_all = units + unused
     targetunits += unused
@@ -60,9 +85,9 @@ def create_units(constants, units, save=None, name=None, overwrite="no", labels=
             path = getcwd()
             print("saving to current working directory")
         ## Check for pre-existence of already saved unitsystems
-        if (
-            overwrite != "yes"
-            and isthere(joinpath(path, ".unit_" + name + ".dat")) is True
+        if overwrite != "yes" and (
+            isthere(joinpath(path, ".unit_" + name + ".npz")) is True
+            or isthere(joinpath(path, ".unit_" + name + ".dat")) is True
         ):
             print(
                 "Unit system system already exists ! \nPlease use a different name or set the overwrite option to yes. i.e. create_units(...., overwrite = 'yes')"
@@ -75,22 +100,8 @@ def create_units(constants, units, save=None, name=None, overwrite="no", labels=
             )
 
         else:
-            temp = []
-            for i in constants:
-                try:  # inbuilt abbrev for the constant
-                    temp.append(i.abbrev)
-                except AttributeError:  # random composite quantity
-                    try:
-                        temp.append((i.value, i.unit.to_string()))
-                    except AttributeError:  # astropy def.quantity
-                        temp.append(((1 * i).si.value, (1 * i).si.unit.to_string()))
-
-            temp2 = []
-            for i in units_all:
-                try:
-                    temp2.append(i.to_string())
-                except AttributeError:
-                    temp2.append(i.to_string())
+            constants_si = [(1 * i).si for i in constants]
+            units_q = [i if isinstance(i, u.Quantity) else 1.0 * i for i in units_all]
             temp3 = []
             for i in si_basis:
                 try:
@@ -99,44 +110,51 @@ def create_units(constants, units, save=None, name=None, overwrite="no", labels=
                     temp3.append(i.to_string())
 
             if labels == []:
+                labels = []
                 for i in constants:
                     try:
                         labels.append(i.abbrev)
                     except AttributeError:
                         labels.append(i.to_string())
 
-            with open(joinpath(path, ".unit_" + name + ".dat"), "w") as f:
-                f.write("#constants \n")
-                f.write(str(temp) + "\n")
-                f.write("#units \n")
-                f.write(str(temp2) + "\n")
-                f.write("#symbols for constants \n")
-                f.write(str(labels) + "\n")
-                f.write("#si-basis \n")
-                f.write(str(temp3) + "\n")
-
-            np.savetxt(
-                joinpath(path, ".unit" + name + ".mat"), unitsysdetails["Matrix-U_SI"]
-            )
+            with open(joinpath(path, ".unit_" + name + ".npz"), "wb") as f:
+                np.savez(
+                    f,
+                    version=np.array(FORMAT_VERSION),
+                    matrix=np.asarray(unitsysdetails["Matrix-U_SI"], dtype=np.float64),
+                    constant_values=np.array([i.value for i in constants_si], dtype=np.float64),
+                    constant_units=np.array([i.unit.to_string() for i in constants_si], dtype=str),
+                    unit_values=np.array([i.value for i in units_q], dtype=np.float64),
+                    unit_units=np.array([i.unit.to_string() for i in units_q], dtype=str),
+                    labels=np.array(labels, dtype=str),
+                    si_basis=np.array(temp3, dtype=str),
+                )
 
     mat_u_si = unitsysdetails["Matrix-U_SI"]
     convert, convertback, getfactor, mat_u_si = __setup_unit_fxns(
-        constants, units, mat_u_si, si_basis
+        constants, units, mat_u_si, si_basis, name
     )
-    print(f"Target units = {targetunits}")
-    print(f"SI units = {si_basis}")
+    if verbose:
+        print(f"Target units = {targetunits}")
+        print(f"SI units = {si_basis}")
     return convert, convertback, getfactor, mat_u_si
 
 
-def load_units(name, save="global"):
+@instrumented
+def load_units(name, save="global", cache=True):
     """
-    Loading saved unit system
+    Loading saved unit system. Systems are read from the `.unit_<name>.npz` files written by :func:`create_units`,
+    or from the `.unit_<name>.dat` text files of older versions when no such file exists.
+    Loaded systems are kept in a process-wide registry, so loading the same unmodified file again returns the already built functions.
+    The registry and the returned functions can be used from several threads at once.
 
     Args :
             **name (str)** : The name of the unit system that has to be loaded
 
             **save (str)** : `'local'` : to load the unit system saved in the current working directory `'global'` : to load the unit system saved in the global directory (home directory of the user)
 
+            **cache (bool)** : `False` to bypass the registry and always read the file
+
     Returns :
         The function returns three functions with three functionalities
 
@@ -145,24 +163,120 @@ def load_units(name, save="global"):
         **2)** function that converts from the New unit system to SI
 
         **3)** function to returns the conversion factor
+
+        The conversion factor of each input unit is computed once and cached, the three functions expose
+        `cache_info()` and `cache_clear()` to inspect and reset this cache.
     """
     from os.path import expanduser as userpath
     from os import getcwd
     from os.path import join as joinpath
     from os.path import exists as isthere
+    from os.path import getmtime
 
     if save == "global":
         path = joinpath(userpath("~"), ".unitconvert")
-        if isthere(joinpath(path, ".unit_" + name + ".dat")) is False:
-            print("Unit system not found in the global directory!")
-            return
+        where = "the global directory"
     else:
         path = getcwd()
-        if isthere(joinpath(path, ".unit_" + name + ".dat")) is False:
-            print("Unit system not found in the current working directory!")
-            return
+        where = "the current working directory"
+    npzfile = joinpath(path, ".unit_" + name + ".npz")
+    datfile = joinpath(path, ".unit_" + name + ".dat")
+
+    if isthere(npzfile):
+        filename = npzfile
+    elif isthere(datfile):
+        filename = datfile
+    else:
+        print(f"Unit system not found in {where}!")
+        return
+    key = (name, path, getmtime(filename))
+    with _registry_lock:
+        if cache and key in _registry:
+            return _registry[key]
+
+        if filename == npzfile:
+            constants, units, si_basis, mat_u_si = _read_npz(npzfile)
+        else:
+            constants, units, si_basis = _read_dat(datfile)
+            mat_u_si = np.genfromtxt(joinpath(path, ".unit" + name + ".mat"))
+
+        convert, convertback, getfactor, mat_u_si = __setup_unit_fxns(
+            constants, units, mat_u_si, si_basis, name
+        )
+        if cache:
+            clear_registry(name, path)
+            _registry[key] = convert, convertback, getfactor, mat_u_si
+    return convert, convertback, getfactor, mat_u_si
+
+
+def clear_registry(name=None, path=None):
+    """
+    Forget unit systems loaded by :func:`load_units`, so that the next call reads them from disk again.
+
+    Args :
+            **name (str)** : only forget the unit systems with this name, all of them if not given
+
+            **path (str)** : only forget the unit systems loaded from this directory, all of them if not given
+    """
+    with _registry_lock:
+        for key in list(_registry):
+            if (name is None or key[0] == name) and (path is None or key[1] == path):
+                del _registry[key]
+
+
+@instrumented
+def preload_units(save="global"):
+    """
+    Load all the unit systems saved in a directory into the registry used by :func:`load_units`.
+
+    Args :
+            **save (str)** : `'local'` for the current working directory `'global'` for the global directory (home directory of the user)
+
+    Returns :
+            **(list)** : the names of the loaded unit systems
+    """
+    from os.path import expanduser as userpath
+    from os import getcwd, listdir
+    from os.path import join as joinpath
+    from os.path import isdir
+
+    path = joinpath(userpath("~"), ".unitconvert") if save == "global" else getcwd()
+    if not isdir(path):
+        return []
+    names = sorted(
+        {
+            i[len(".unit_") : -len(".npz")]
+            for i in listdir(path)
+            if i.startswith(".unit_") and i.endswith((".npz", ".dat"))
+        }
+    )
+    for name in names:
+        load_units(name, save=save)
+    return names
+
+
+def _read_npz(filename):
+    with np.load(filename, allow_pickle=False) as data:
+        version = int(data["version"])
+        if version > FORMAT_VERSION:
+            raise ValueError(
+                f"{filename} was written with format version {version}, this version of unitconvert reads up to {FORMAT_VERSION}"
+            )
+        constants = [
+            u.Quantity(value, unit)
+            for value, unit in zip(data["constant_values"], data["constant_units"])
+        ]
+        units = [
+            u.Quantity(value, unit)
+            for value, unit in zip(data["unit_values"], data["unit_units"])
+        ]
+        si_basis = [u.Unit(i) for i in data["si_basis"]]
+        mat_u_si = data["matrix"]
+    return constants, units, si_basis, mat_u_si
+
 
-    with open(joinpath(path, ".unit_" + name + ".dat"), "r") as f:
+def _read_dat(filename):
+    with open(filename, "r") as f:
         lines = f.readlines()
         t_cons = eval(lines[1])
         constants = []
@@ -191,29 +305,31 @@ def load_units(name, save="global"):
                 value = float(item[0])
                 unit_temp = item[1]
                 si_basis.append(u.Quantity(unit=unit_temp, value=value))
-    mat_u_si = np.genfromtxt(joinpath(path, ".unit" + name + ".mat"))
-
-    convert, convertback, getfactor, mat_u_si = __setup_unit_fxns(
-        constants, units, mat_u_si, si_basis
-    )
-    return convert, convertback, getfactor, mat_u_si
+    return constants, units, si_basis
 
 
-def __setup_unit_fxns(constants: list[u.Quantity], units, mat_u_si, si_basis):
-    def convfactor(q):
-        dimdict = getdim(q)
-        si_powers = np.array([dimdict[i] for i in si_basis])
+def __setup_unit_fxns(constants: list[u.Quantity], units, mat_u_si, si_basis, name=None):
+    @lru_cache(maxsize=FACTOR_CACHE_SIZE)
+    def unitfactor(unit):
+        dim = getdim(unit)
+        si_powers = np.array([dim[i] for i in si_basis], dtype=float)
         cu_powers = np.einsum("ij,j->i", mat_u_si, si_powers)
+        si_powers.flags.writeable = False
+        cu_powers.flags.writeable = False
         lc = len(constants)
         con_powers = cu_powers[:lc]
         unit_powers = cu_powers[lc:]
-        _tC = math.prod([j ** (con_powers[i]) for i, j in enumerate(constants)])
-        _tU = math.prod([j ** (unit_powers[i]) for i, j in enumerate(units)])
+        _tC = math.prod([power(j, con_powers[i]) for i, j in enumerate(constants)])
+        _tU = math.prod([power(j, unit_powers[i]) for i, j in enumerate(units)])
         factor = (_tC * _tU).si
         returnunits = _tU
         return factor, returnunits, si_powers, cu_powers
 
-    def convert(q):
+    def convfactor(q):
+        return unitfactor(q if isinstance(q, u.UnitBase) else q.unit)
+
+    @instrumented
+    def convert(q, inplace=False):
         """
         SI to Whatever-Units system : Function that converts SI astropy quantities to new units
 
@@ -222,12 +338,22 @@ def __setup_unit_fxns(constants: list[u.Quantity], units, mat_u_si, si_basis):
 
         q : astropy.quantitiy
             The instance of the class astropy quantity that needs to be converted
+        inplace : bool
+            Rescale the buffer of `q`, which must hold floats, instead of copying it
         """
+        if inplace:
+            res = convert(1.0 * q.unit)
+            return rescale_inplace(q, res.value, res.unit)
+        if isinstance(q, u.Quantity) and q.ndim:
+            # Arrays take a single NumPy multiplication, which releases the GIL, by the factor of their unit
+            res = convert(1.0 * q.unit)
+            return np.multiply(q.view(np.ndarray), res.value) << res.unit
         q = (1 * q * u.dimensionless_unscaled).si
         f, r, _, _ = convfactor(q)
         return (q / f) * r
 
-    def convertback(q, finalunits):
+    @instrumented
+    def convertback(q, finalunits, inplace=False):
         """
         Whatever-Units to SI : Function that converts astropy quantities in new units back to SI
 
@@ -238,11 +364,20 @@ def __setup_unit_fxns(constants: list[u.Quantity], units, mat_u_si, si_basis):
             The instance of the class astropy quantity that needs to be converted
         finalunits : astropy.quantity
                      The final units as astropy quantities to which we need to convert back to
+        inplace : bool
+            Rescale the buffer of `q`, which must hold floats, instead of copying it
         """
+        if inplace:
+            res = convertback(1.0 * q.unit, finalunits)
+            return rescale_inplace(q, res.value, res.unit)
+        if isinstance(q, u.Quantity) and q.ndim:
+            res = convertback(1.0 * q.unit, finalunits)
+            return np.multiply(q.view(np.ndarray), res.value) << res.unit
         q = (q * u.dimensionless_unscaled).si
         f, r, _, _ = convfactor(finalunits)
         return (q * f / r).to(finalunits)
 
+    @instrumented
     def getfactor(q):
         """
         Get the conversion factor
@@ -261,17 +396,54 @@ def __setup_unit_fxns(constants: list[u.Quantity], units, mat_u_si, si_basis):
         }
         return factorlist
 
+    for fxn in (convert, convertback, getfactor):
+        fxn.cache_info = unitfactor.cache_info
+        fxn.cache_clear = unitfactor.cache_clear
+    register_cache(f"custom.{name or 'unnamed'}", unitfactor)
     return convert, convertback, getfactor, mat_u_si
 
 
-def checksystem(ls):
+def _system_matrix(ls):
+    userUnits = [1 * i for i in ls]
+
+    dims = [getdim(i) for i in userUnits]
+    used = [k for k in range(len(defaults.si)) if any(d[k] for d in dims)]
+    uDep = [defaults.si[k] for k in used]
+
+    unUsedSubSpace = [i for i in defaults.si if i not in uDep]
+
+    if len(uDep) != len(userUnits):
+        raise ValueError(
+            f"\nTo replace standard units \
+with the ones given,the dimensions should match. That is, n units from the \
+custom-unit system can replace exactly n replaceable-units from the standard \
+unit system.\nNumber[Custom-units]={len(userUnits)}, \
+\nNumber[replaceable-units]={len(uDep)},\
+\nCustom-units = {userUnits}, \nReplaceable-units = {uDep}\nThe easiest \
+solution is to add one of the replaceable units to the custom-units.\n"
+        )
+    dimSpace2 = len(unUsedSubSpace)
+    dimSpace1 = len(uDep)
+    mat1 = np.array([[d[k] * 1.0 for d in dims] for k in used])
+    mat2 = np.array(np.identity(len(unUsedSubSpace)))
+    mat = np.block(
+        [
+            [mat1, np.zeros((dimSpace1, dimSpace2))],
+            [np.zeros((dimSpace2, dimSpace1)), mat2],
+        ]
+    )
+    return userUnits, uDep, unUsedSubSpace, mat
+
+
+@instrumented
+def checksystem(ls, verbose=True):
     """
     Check if the user defined unit system can be transformed to and from SI units.
 
     Args :
         **ls (list)** : a list of astropy quantities belonging to the custom unit system
 
-        **want_details (boolean)** : if `True` returns details about the passed custom-unit system
+        **verbose (boolean)** : `False` to not print a message when the system is valid
 
     Returns :
         None : default
@@ -288,40 +460,13 @@ def checksystem(ls):
         Custom-unit system looks good ! :)
     """
 
-    userUnits = ls
-    userUnits = [1 * i for i in userUnits]
-
-    u2si = {i: getdim(i) for i in userUnits}
-
-    uDep0 = {j for i in userUnits for j in getdim(i).keys()}
-    uDep = [i for i in si if i in uDep0]
-
-    unUsedSubSpace = [i for i in si if i not in uDep]
-
-    assert len(uDep) == len(userUnits), (
-        f"\nTo replace standard units \
-with the ones given,the dimensions should match. That is, n units from the \
-custom-unit system can replace exactly n replaceable-units from the standard \
-unit system.\nNumber[Custom-units]={len(userUnits)}, \
-\nNumber[replaceable-units]={len(uDep)},\
-\nCustom-units = {userUnits}, \nReplaceable-units = {uDep}\nThe easiest \
-solution is to add one of the replaceable units to the custom-units.\n"
-    )
-    dimSpace2 = len(unUsedSubSpace)
-    dimSpace1 = len(uDep)
-    mat1 = np.array([[u2si[j][i] * 1.0 for j in userUnits] for i in uDep])
-    mat2 = np.array(np.identity(len(unUsedSubSpace)))
-    mat = np.block(
-        [
-            [mat1, np.zeros((dimSpace1, dimSpace2))],
-            [np.zeros((dimSpace2, dimSpace1)), mat2],
-        ]
-    )
+    userUnits, uDep, unUsedSubSpace, mat = _system_matrix(ls)
 
     try:
-        matInv = np.linalg.inv(mat)
-        print("Custom-unit system looks good ! :) ")
-    except np.linalg.LinAlgError:
+        matInv = np.array(inverse(mat), dtype=float)
+        if verbose:
+            print("Custom-unit system looks good ! :) ")
+    except SingularMatrixError:
         raise Exception(
             "The unit system transformation matrix is singular \
 => Degenerate units are given in custom-units "
@@ -335,11 +480,129 @@ solution is to add one of the replaceable units to the custom-units.\n"
     }
 
 
+#: Determinants below this magnitude mark a system as singular in :func:`checksystems`.
+SINGULAR_TOLERANCE = 1e-9
+
+
+@instrumented
+def checksystems(specs):
+    """
+    Check many custom unit systems at once, for instance when sweeping over the constants that are set to 1.
+    The transformation matrices of all the systems are stacked into one array, their determinants are computed together,
+    and all the invertible ones are inverted by a single call to `numpy.linalg.inv`. Nothing is printed and no exception is raised.
+
+    Args :
+        **specs (list)** : the systems, each a list of astropy quantities as taken by :func:`checksystem`,
+        or a dictionary with the lists `'constants'` and `'units'` as taken by :class:`UnitSystem`
+
+    Returns :
+        **(list)** : one dictionary per system with the keys of :func:`checksystem`, plus `'valid'`, `'singular'` and `'error'`.
+        The matrices are None when the dimensions of the system do not match, and `'Matrix-U_SI'` is None when it is singular.
+
+    Example :
+        >>> from unitconvert.custom import checksystems
+        >>> from astropy import units as u
+        >>> from astropy import constants as c
+        >>> [r["valid"] for r in checksystems([[c.c, c.hbar, u.eV], [c.c, u.m / u.s], [c.c]])]
+        [True, False, False]
+    """
+    results = []
+    for spec in specs:
+        if isinstance(spec, dict):
+            spec = list(spec["constants"]) + list(spec["units"])
+        result = {
+            "valid": False,
+            "singular": False,
+            "error": None,
+            "Matrix-SI_U": None,
+            "Matrix-U_SI": None,
+            "Custom-units": None,
+            "SI-related": None,
+            "SI-unrelated": None,
+        }
+        try:
+            userUnits, uDep, unUsedSubSpace, mat = _system_matrix(spec)
+        except ValueError as err:
+            result["error"] = str(err).strip()
+        else:
+            result.update(
+                {
+                    "Matrix-SI_U": mat,
+                    "Custom-units": userUnits,
+                    "SI-related": uDep,
+                    "SI-unrelated": unUsedSubSpace,
+                }
+            )
+        results.append(result)
+
+    checked = [r for r in results if r["Matrix-SI_U"] is not None]
+    if not checked:
+        return results
+    stack = np.stack([r["Matrix-SI_U"] for r in checked])
+    singular = np.abs(np.linalg.det(stack)) < SINGULAR_TOLERANCE
+    inverses = np.linalg.inv(stack[~singular])
+    regular = iter(inverses)
+    for r, flag in zip(checked, singular):
+        if flag:
+            r["singular"] = True
+            r["error"] = "The unit system transformation matrix is singular => Degenerate units are given in custom-units"
+        else:
+            r["valid"] = True
+            r["Matrix-U_SI"] = next(regular)
+    return results
+
+
 class UnitSystem:
+    """
+    A custom unit system built from `params`, a dictionary with the lists `'constants'` and `'units'` taken by :func:`create_units`.
+    The conversion factors of all the dimensions with small integer exponents of mass, length, time, current and temperature
+    are computed at once when the object is created, other dimensions are added on first use. Conversions are then
+    a table lookup and a single multiplication. Creating the object prints nothing.
+    An object can be shared between threads, the table is only extended while holding a lock.
+    """
+
+    #: Exponents tabulated for each dimension when the object is created, in the order of :data:`unitconvert.defaults.si`.
+    TABLE_EXPONENTS = (
+        range(-3, 4),
+        range(-3, 4),
+        range(-3, 4),
+        range(-1, 2),
+        range(-1, 2),
+        (0,),
+        (0,),
+        (0,),
+    )
+
     def __init__(self, params):
-        convert, convertback, _, _ = create_units(params["constants"], params["units"])
-        self.__conv__ = convert
-        self.__convback__ = lambda q, f: convertback(q, f)
+        constants = list(params["constants"])
+        units = list(params["units"])
+        details = checksystem(constants + units, verbose=False)
+        si_basis = details["SI-related"] + details["SI-unrelated"]
+        targets = constants + units + details["SI-unrelated"]
+        lc = len(constants)
+
+        self.__order__ = [defaults.si.index(i) for i in si_basis]
+        self.__mat__ = details["Matrix-U_SI"]
+        self.__bases__ = [
+            i if isinstance(i, u.UnitBase) else i.unit for i in targets[lc:]
+        ]
+        self.__lc__ = lc
+        # SI values of the targets set to 1 (F), and values of the quantities given as units (R)
+        self.__fvalues__ = np.array([(1 * i).si.value for i in targets], dtype=float)
+        self.__rvalues__ = np.array(
+            [i.value if isinstance(i, u.Quantity) else 1.0 for i in targets[lc:]],
+            dtype=float,
+        )
+        self.__scales__ = {}
+        self.__units__ = {}
+        self.__lock__ = threading.Lock()
+        self.__hits__ = 0
+        self.__misses__ = 0
+        grid = np.array(np.meshgrid(*self.TABLE_EXPONENTS, indexing="ij"))
+        self.__tabulate__(grid.reshape(len(defaults.si), -1).T)
+
+        self.__plan__ = cached_planner(self.from_another)
+        register_cache("custom.UnitSystem", self)
 
         self.L = self.equivalent_unit(u.m)
         self.M = self.equivalent_unit(u.kg)
@@ -355,19 +618,75 @@ class UnitSystem:
         self.Pressure = self.Force / self.L**2
         self.Momentum = self.M * self.Speed
 
-    def from_another(self, q):
+    def __tabulate__(self, dims):
+        # Conversion scales of an array of SI exponent vectors, stored in the lookup table
+        cu_powers = dims[:, self.__order__] @ self.__mat__.T
+        fscale = np.prod(self.__fvalues__ ** cu_powers, axis=1)
+        rscale = np.prod(self.__rvalues__ ** cu_powers[:, self.__lc__ :], axis=1)
+        self.__scales__.update(zip(map(tuple, dims.tolist()), (rscale / fscale).tolist()))
+        return cu_powers
+
+    def __lookup__(self, unit):
+        # Scale and unit of the converted values for a quantity in `unit`, scale being relative to SI
+        dims, siscale = dimsignature(unit)
+        scale = self.__scales__.get(dims)
+        runit = self.__units__.get(dims)
+        if scale is None or runit is None:
+            with self.__lock__:
+                self.__misses__ += 1
+                if dims not in self.__scales__:
+                    self.__tabulate__(np.array([dims], dtype=float))
+                if dims not in self.__units__:
+                    cu_powers = np.array([dims], dtype=float)[:, self.__order__] @ self.__mat__.T
+                    self.__units__[dims] = u.CompositeUnit(
+                        1, self.__bases__, cu_powers[0, self.__lc__ :].tolist()
+                    )
+            scale = self.__scales__[dims]
+            runit = self.__units__[dims]
+        else:
+            self.__hits__ += 1
+        return siscale * scale, runit
+
+    def cache_info(self):
         """
-        Convert from another unit system to the unit system of the instantitated object.
+        The number of conversions that found their dimension in the lookup table (hits) or had to extend it (misses),
+        and the number of tabulated dimensions
         """
-        return self.__conv__(q)
+        return CacheInfo(self.__hits__, self.__misses__, None, len(self.__scales__))
 
-    def to_another(self, q, f):
+    @instrumented
+    def from_another(self, q, inplace=False):
+        """
+        Convert from another unit system to the unit system of the instantitated object.
+        A :class:`unitconvert.daskarray.LazyQuantity` is converted lazily.
+        With `inplace=True` the buffer of `q` is rescaled instead of copied.
+        """
+        if isinstance(q, LazyQuantity):
+            return q.convert(self)
+        if not isinstance(q, u.Quantity):
+            q = 1 * q * u.dimensionless_unscaled
+        scale, runit = self.__lookup__(q.unit)
+        if inplace:
+            return rescale_inplace(q, scale, runit)
+        return np.multiply(q.view(np.ndarray), scale) << runit
+
+    @instrumented
+    def to_another(self, q, f, inplace=False):
         """
         Convert `q` from unit system of the instantiated object to the units f.
-        Note that dimensions of `f` must match that of `q`
+        Note that dimensions of `f` must match that of `q`.
+        With `inplace=True` the buffer of `q` is rescaled instead of copied.
         """
-        return self.__convback__(q, f)
-
+        f = u.Unit(f)
+        scale, runit = self.__lookup__(f)
+        if not isinstance(q, u.Quantity):
+            q = 1 * q * u.dimensionless_unscaled
+        scale = q.unit.to(runit) / scale
+        if inplace:
+            return rescale_inplace(q, scale, f)
+        return np.multiply(q.view(np.ndarray), scale) << f
+
+    @instrumented
     def from_another_value(self, q):
         """
         Convert from another unit system to the unit system of the instantitated object
@@ -375,8 +694,25 @@ class UnitSystem:
         """
         return (self.from_another(q)).value
 
+    @instrumented
     def equivalent_unit(self, q):
         """
         Find the equivalent unit of the passed quantity in the unit system of the instantiated object.
         """
         return self.from_another(1.0 * q)
+
+    @instrumented
+    def plan(self, unit):
+        """
+        Compile the conversion of values given in `unit` to the unit system of the instantiated object.
+        Plans are cached per input unit.
+        """
+        return self.__plan__(u.Unit(unit))
+
+    @instrumented
+    def from_another_table(self, table):
+        """
+        Convert all the columns of `table` (a dictionary of quantities or an astropy QTable) to the unit system
+        of the instantiated object. Columns sharing a unit share one conversion factor.
+        """
+        return convert_columns(table, self.plan)
@@ -0,0 +1,96 @@
+from unitconvert._lazy import u, np
+
+
+def _scale(block, scale):
+    return np.multiply(block, scale)
+
+
+def is_lazy(values):
+    """
+    Whether `values` is a chunked array, such as a `dask.array.Array`, that is converted block by block through `map_blocks`
+    """
+    return hasattr(values, "map_blocks")
+
+
+def rescale(array, scale):
+    """
+    Multiply the chunked `array` by the float `scale` without computing it. Only a task per block is added to the graph.
+    """
+    dtype = np.result_type(array.dtype, np.float64)
+    return array.map_blocks(_scale, scale=scale, dtype=dtype)
+
+
+class LazyQuantity:
+    """
+    A chunked array, such as a `dask.array.Array`, together with its astropy unit.
+    Astropy quantities cannot hold dask arrays without computing them, so conversions of a `LazyQuantity`
+    compute the scale factor once on the client and add it to the task graph with `map_blocks`.
+    Nothing is computed until :meth:`compute` is called, and the blocks are then converted by dask's schedulers.
+
+    Args :
+            **value (dask array)** : the values, expressed in `unit`
+
+            **unit (astropy unit)** : the unit of `value`
+
+    Example :
+            >>> import dask.array as da
+            >>> from astropy import units as u
+            >>> from unitconvert.daskarray import LazyQuantity
+            >>> q = LazyQuantity(da.ones(10**8, chunks=10**6), u.m)
+            >>> q.convert("natural")
+            <LazyQuantity shape=(100000000,) 1 / eV>
+            >>> q.convert("natural").compute()
+            <Quantity [5067730.7161564, 5067730.7161564, ..., 5067730.7161564] 1 / eV>
+    """
+
+    __slots__ = ("value", "unit")
+
+    def __init__(self, value, unit):
+        self.value = value
+        self.unit = u.Unit(unit)
+
+    def __repr__(self):
+        return f"<LazyQuantity shape={self.value.shape} {self.unit}".rstrip() + ">"
+
+    def to(self, unit):
+        """
+        Express the values in `unit`, which must have the same dimensions
+        """
+        unit = u.Unit(unit)
+        if unit == self.unit:
+            return self
+        return LazyQuantity(rescale(self.value, self.unit.to(unit)), unit)
+
+    def convert(self, system):
+        """
+        Convert the values to `system`, see :func:`unitconvert.plan.get_planner`
+        """
+        return convert_dask(self.value, self.unit, system)
+
+    def compute(self, **kwargs):
+        """
+        Compute the values with dask and return them as an astropy quantity. Keyword arguments are passed to `compute`.
+        """
+        return np.asarray(self.value.compute(**kwargs)) << self.unit
+
+
+def convert_dask(array, unit, system):
+    """
+    Convert the chunked `array` given in `unit` to `system` lazily.
+    The conversion factor is compiled once in the calling process and each block is multiplied by it, so the task graph
+    stays lazy and scales across the cores used by dask's local or distributed schedulers.
+
+    Args :
+            **array (dask array)** : the values which need to be converted
+
+            **unit (astropy unit)** : the unit of `array`
+
+            **system** : the target unit system, see :func:`unitconvert.plan.get_planner`
+
+    Returns :
+            **(LazyQuantity)** : the converted values and their unit
+    """
+    from unitconvert.plan import get_planner
+
+    plan = get_planner(system)(unit)
+    return LazyQuantity(rescale(array, plan.scale), plan.target)
@@ -1,3 +1,12 @@
-from astropy import units as u
+from unitconvert._lazy import u
 
-si = [u.kg, u.m, u.s, u.Kelvin, u.A, u.mol, u.cd, u.rad]
+__all__ = ["si"]
+
+
+def __getattr__(name):
+    # si is built on first access so that importing this module does not import astropy
+    if name == "si":
+        global si
+        si = [u.kg, u.m, u.s, u.Kelvin, u.A, u.mol, u.cd, u.rad]
+        return si
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
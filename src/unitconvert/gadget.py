@@ -1,21 +1,61 @@
+import threading
+from functools import lru_cache
 from unitconvert.getdimensions import getdim
-import astropy.units as u
+from unitconvert._lazy import u
+from unitconvert.instrument import instrumented
+from unitconvert.plan import PLAN_CACHE_SIZE, ConversionPlan, cached_planner, convert_columns
+from unitconvert.daskarray import LazyQuantity
 
-gM = u.def_unit("gM", 1.989e43 * u.g)
-gL = u.def_unit("gL", 3.085678e21 * u.cm)
-gV = u.def_unit("gV", 1e5 * u.cm / u.s)
-gT = u.def_unit("gT", 3.085678e16 * u.s)
-# A value of G = 6.6743e-8*u.cm**3/u.g/u.s**2 translates to the below given value
-gG = 43021.93132271094 * gL**3 / gM / gT**2
+__all__ = [
+    "gM",
+    "gL",
+    "gV",
+    "gT",
+    "gG",
+    "toGadget",
+    "fromGadget",
+    "reverse_converter",
+    "plan",
+    "toGadgetTable",
+    "toGadgetValues",
+]
 
+_units_lock = threading.Lock()
 
-def toGadget(q):
+
+def _define_units():
+    # The units are defined on first use so that importing this module does not import astropy
+    global gM, gL, gV, gT, gG
+    if "gG" in globals():
+        return
+    with _units_lock:
+        if "gG" in globals():
+            return
+        gM = u.def_unit("gM", 1.989e43 * u.g)
+        gL = u.def_unit("gL", 3.085678e21 * u.cm)
+        gV = u.def_unit("gV", 1e5 * u.cm / u.s)
+        gT = u.def_unit("gT", 3.085678e16 * u.s)
+        # A value of G = 6.6743e-8*u.cm**3/u.g/u.s**2 translates to the below given value
+        gG = 43021.93132271094 * gL**3 / gM / gT**2
+
+
+def __getattr__(name):
+    if name in ("gM", "gL", "gV", "gT", "gG"):
+        _define_units()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+@instrumented
+def toGadget(q, inplace=False):
     """
     Find the conversion factor that is used to convert the given quantity q to and from units used in the :math:`N`-body code ``GAGDGET-2`` and SI units
 
     Args :
             **q (astropy quantity)** : the quantity for which unit conversion must be done
 
+            **inplace (bool)** : rescale the buffer of `q`, which must hold floats, instead of copying it. `q` is overwritten and shares its memory with the result
+
     Returns :
             **(astropy quantity)** : the input quantity `q` in gadget units
 
@@ -25,20 +65,19 @@ def toGadget(q):
             >>> toGadget(1*u.pc)
             <Quantity 0.001 gL>
     """
+    if isinstance(q, LazyQuantity):
+        return q.convert("gadget")
+    if inplace or (isinstance(q, u.Quantity) and q.ndim):
+        # Arrays take a single NumPy multiplication, which releases the GIL, by the cached factor of their unit
+        return plan(q.unit)(q, inplace=inplace)
     q = 1 * q
-    dimdict = getdim(q=q)
-    a = dimdict[u.kg]
-    b = dimdict[u.m]
-    c = dimdict[u.s]
-    d = dimdict[u.A]
-    e = dimdict[u.K]
-    f = dimdict[u.cd]
-    g = dimdict[u.mol]
-    h = dimdict[u.rad]
+    a, b, c, e, d, g, f, h = getdim(q)
+    _define_units()
     return q.to(gM**a * gL**b * gT**c * u.A**d * u.K**e * u.cd**f * u.mol**g * u.rad**h)
 
 
-def fromGadget(q, finalUnits=None):
+@instrumented
+def fromGadget(q, finalUnits=None, inplace=False):
     """
     Find the conversion factor that is used to convert the given quantity q given in units of :math:`N`-body code ``GAGDGET-2`` to SI units
 
@@ -47,6 +86,8 @@ def fromGadget(q, finalUnits=None):
 
             **finalUnits** : optional argument to specify the units to which `q` must be converted. Defaults to standard astronomical units [kpc, solMass, Gyr] if not specified.
 
+            **inplace (bool)** : rescale the buffer of `q`, which must hold floats, instead of copying it. `q` is overwritten and shares its memory with the result
+
     Returns :
             **(astropy quantity)** : the input quantity `q` in astronomical units or specified units.
 
@@ -56,16 +97,11 @@ def fromGadget(q, finalUnits=None):
             >>> toGadget(0.001*gL)
             <Quantity 0.001 kpc>
     """
+    if isinstance(q, LazyQuantity) or inplace or (isinstance(q, u.Quantity) and q.ndim):
+        finalUnits = None if finalUnits is None else u.Unit(finalUnits)
+        return _reverse_plan(q.unit, finalUnits)(q, inplace=inplace)
     q = 1 * q
-    dimdict = getdim(q=q)
-    a = dimdict[u.kg]
-    b = dimdict[u.m]
-    c = dimdict[u.s]
-    d = dimdict[u.A]
-    e = dimdict[u.K]
-    f = dimdict[u.cd]
-    g = dimdict[u.mol]
-    h = dimdict[u.rad]
+    a, b, c, e, d, g, f, h = getdim(q)
     if finalUnits is None:
         return q.to(
             u.solMass**a
@@ -79,3 +115,90 @@ def fromGadget(q, finalUnits=None):
         )
     elif finalUnits is not None:
         return q.to(finalUnits)
+
+
+_plan = cached_planner(toGadget)
+
+
+@lru_cache(maxsize=PLAN_CACHE_SIZE)
+def _reverse_plan(unit, finalUnits):
+    res = fromGadget(1.0 * unit, finalUnits)
+    return ConversionPlan(unit, float(res.value), res.unit)
+
+
+@instrumented
+def reverse_converter(finalUnits):
+    """
+    Compile the conversion of quantities in Gadget units to `finalUnits` once, for repeated use.
+    Unlike :func:`fromGadget`, the returned callable raises `astropy.units.UnitConversionError` for quantities
+    of other dimensions instead of returning a string.
+
+    Args :
+            **finalUnits (astropy unit)** : the units to which quantities are converted
+
+    Returns :
+            **(ConversionPlan)** : a vectorized callable converting quantities, or raw values expressed in `plan(finalUnits).target`, to `finalUnits`
+
+    Example :
+            >>> from unitconvert.gadget import reverse_converter
+            >>> from astropy import units as u
+            >>> from unitconvert.gadget import gL
+            >>> toKpc = reverse_converter(u.kpc)
+            >>> toKpc([1.0, 2.0] * gL)
+            <Quantity [1.00000014, 2.00000027] kpc>
+    """
+    return plan(finalUnits).inverse()
+
+
+@instrumented
+def plan(unit):
+    """
+    Compile the conversion of values given in `unit` to gadget units. Plans are cached per input unit,
+    so converting many arrays that share a unit costs a single multiplication each.
+
+    Args :
+            **unit (astropy unit)** : the unit of the values that need to be converted
+
+    Returns :
+            **(ConversionPlan)** : a callable that converts values or quantities given in `unit` to gadget units
+
+    Example :
+            >>> from unitconvert.gadget import plan
+            >>> from astropy import units as u
+            >>> plan(u.pc)
+            <ConversionPlan pc -> 0.0009999998643706075 gL>
+    """
+    return _plan(u.Unit(unit))
+
+
+@instrumented
+def toGadgetTable(table):
+    """
+    Convert all the columns of `table` to gadget units in one call. Columns sharing a unit share one conversion factor.
+
+    Args :
+            **table (dict or astropy QTable)** : a mapping of column names to astropy quantities
+
+    Returns :
+            **(dict or astropy QTable)** : the converted columns, of the same kind as `table`
+    """
+    return convert_columns(table, plan)
+
+
+@instrumented
+def toGadgetValues(values, unit, out=None):
+    """
+    Convert raw values given in `unit` to gadget units without going through astropy quantities.
+    The conversion factor is computed once per unit and applied with a single multiplication.
+
+    Args :
+            **values (array_like)** : the values which need to be converted, expressed in `unit`
+
+            **unit (astropy unit)** : the unit of `values`
+
+            **out (numpy array)** : optional buffer receiving the result, which may be `values` itself
+
+    Returns :
+            **(numpy array)** : the converted values, expressed in `plan(unit).target`
+    """
+    return plan(unit).apply(values, out=out)
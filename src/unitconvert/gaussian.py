@@ -1,10 +1,19 @@
-from unitconvert.getdimensions import *
-import astropy.units as u
-import astropy.constants as acon
-from collections import defaultdict
+from unitconvert._lazy import u, acon
+from unitconvert.instrument import instrumented
 from math import pi as pi
+from unitconvert.plan import convert_columns
+from unitconvert.compiler import CompiledSystem
 
+#: Gaussian units, where :math:`4\pi\epsilon_0 = 1` and quantities are expressed in cgs units
+GAUSSIAN = CompiledSystem(
+    "Gaussian",
+    {"4 pi eps0": lambda: 4 * pi * acon.eps0},
+    ["kg", "m", "s", "K"],
+    finish=lambda q: q.cgs,
+)
 
+
+@instrumented
 def factorGaussian(q):
     """
     Find the conversion factor that is used to convert the given quantity q to and from CGS Gaussian units and SI units
@@ -19,20 +28,21 @@ def factorGaussian(q):
             >>> from unitconvert.gaussian import factorGaussian
             >>> from astropy import units as u
             >>> factorGaussian(1*u.A)
-            {'4 pi eps0' : 0.5 }
+            {'4 pi eps0': 0.5}
     """
-    dimdict = getdim(q.si)
-    factorlist = {"4 pi eps0": dimdict[u.A] / 2}
-    return factorlist
+    return GAUSSIAN.factor(q)
 
 
-def toGaussian(q):
+@instrumented
+def toGaussian(q, inplace=False):
     """
     Convert the given astropy quantity `q` in SI units to Gaussian units
 
     Args :
             **q (astropy quantity)** : the quantity which needs to be converted
 
+            **inplace (bool)** : rescale the buffer of `q`, which must hold floats, instead of copying it. `q` is overwritten and shares its memory with the result
+
     Returns :
             **(astropy quantity)** : the input quantity `q` in gaussian units
 
@@ -42,36 +52,14 @@ def toGaussian(q):
             >>> toGaussian(1*u.A)
             <Quantity 2.99792458e+09 Fr / s>
     """
-
-    q = q.si
-    dimdict = getdim(q)
-    a = dimdict[u.kg]
-    b = dimdict[u.m]
-    c = dimdict[u.s]
-    d = dimdict[u.A]
-    e = dimdict[u.K]
-    f = dimdict[u.cd]
-    g = dimdict[u.mol]
-    h = dimdict[u.rad]
-    factor = (4 * pi * acon.eps0) ** (d / 2)
-    natqu = q / factor
     try:
-        return (
-            natqu.to(
-                u.kg ** (a + d / 2)
-                * u.m ** (b + 3 * d / 2)
-                * u.s ** (c - 2 * d)
-                * u.K**e
-                * u.cd**f
-                * u.mol**g
-                * u.rad**h
-            )
-        ).cgs
-    except:
+        return GAUSSIAN.convert(q, inplace=inplace)
+    except u.UnitConversionError:
         return "Cannot convert"
 
 
-def fromGaussian(q, finalUnits):
+@instrumented
+def fromGaussian(q, finalUnits, inplace=False):
     """
     Convert the given astropy quantity `q` in gaussian units to SI units
 
@@ -80,6 +68,8 @@ def fromGaussian(q, finalUnits):
 
             **finalUnits (astropy quantity)** : the base units to which quantity needs to be converted back.
 
+            **inplace (bool)** : rescale the buffer of `q`, which must hold floats, instead of copying it. `q` is overwritten and shares its memory with the result
+
     Returns :
             **(astropy quantity)** : the input quantity `q` in SI units
 
@@ -89,11 +79,84 @@ def fromGaussian(q, finalUnits):
             >>> fromGaussian(2.99792458e9 * u.Fr / u.s)
             <Quantity 1. A>
     """
-
-    fac = factorGaussian(finalUnits)
-    factor = (4 * pi * acon.eps0) ** fac["4 pi eps0"]
     try:
-        return (q * factor).to(finalUnits)
-    except:
+        return GAUSSIAN.convertback(q, finalUnits, inplace=inplace)
+    except u.UnitConversionError:
         return "Cannot convert"
 
+
+@instrumented
+def reverse_converter(finalUnits):
+    """
+    Compile the conversion of quantities in Gaussian units to `finalUnits` once, for repeated use.
+    Unlike :func:`fromGaussian`, the returned callable raises `astropy.units.UnitConversionError` for quantities
+    of other dimensions instead of returning a string.
+
+    Args :
+            **finalUnits (astropy unit)** : the units to which quantities are converted
+
+    Returns :
+            **(ConversionPlan)** : a vectorized callable converting quantities, or raw values expressed in `plan(finalUnits).target`, to `finalUnits`
+
+    Example :
+            >>> from unitconvert.gaussian import reverse_converter
+            >>> from astropy import units as u
+            >>> toAmperes = reverse_converter(u.A)
+            >>> toAmperes([2.99792458e9, 1e10] * u.Fr / u.s)
+            <Quantity [1.        , 3.33564095] A>
+    """
+    return GAUSSIAN.reverse_converter(finalUnits)
+
+
+@instrumented
+def plan(unit):
+    """
+    Compile the conversion of values given in `unit` to Gaussian units. Plans are cached per input unit,
+    so converting many arrays that share a unit costs a single multiplication each.
+
+    Args :
+            **unit (astropy unit)** : the unit of the values that need to be converted
+
+    Returns :
+            **(ConversionPlan)** : a callable that converts values or quantities given in `unit` to Gaussian units
+
+    Example :
+            >>> from unitconvert.gaussian import plan
+            >>> from astropy import units as u
+            >>> plan(u.A)
+            <ConversionPlan A -> 2997924579.8002987 statA>
+    """
+    return GAUSSIAN.plan(unit)
+
+
+@instrumented
+def toGaussianTable(table):
+    """
+    Convert all the columns of `table` to Gaussian units in one call. Columns sharing a unit share one conversion factor.
+
+    Args :
+            **table (dict or astropy QTable)** : a mapping of column names to astropy quantities
+
+    Returns :
+            **(dict or astropy QTable)** : the converted columns, of the same kind as `table`
+    """
+    return convert_columns(table, plan)
+
+
+@instrumented
+def toGaussianValues(values, unit, out=None):
+    """
+    Convert raw values given in `unit` to Gaussian units without going through astropy quantities.
+    The conversion factor is computed once per unit and applied with a single multiplication.
+
+    Args :
+            **values (array_like)** : the values which need to be converted, expressed in `unit`
+
+            **unit (astropy unit)** : the unit of `values`
+
+            **out (numpy array)** : optional buffer receiving the result, which may be `values` itself
+
+    Returns :
+            **(numpy array)** : the converted values, expressed in `plan(unit).target`
+    """
+    return plan(unit).apply(values, out=out)
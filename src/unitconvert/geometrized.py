@@ -1,8 +1,13 @@
-from unitconvert.getdimensions import *
-import astropy.units as u
-import astropy.constants as acon
+from unitconvert._lazy import u
+from unitconvert.instrument import instrumented
+from unitconvert.plan import convert_columns
+from unitconvert.compiler import CompiledSystem
 
+#: Geometrized units, where :math:`c = G = 1` and the remaining dimensions are powers of m, K and A
+GEOMETRIZED = CompiledSystem("Geometrized", {"c": "c", "G": "G"}, ["m", "K", "A"])
 
+
+@instrumented
 def factorGeometrized(q):
     """
     Find the conversion factor that is used to convert the given quantity q to and from Geometrized units and SI units
@@ -17,25 +22,21 @@ def factorGeometrized(q):
             >>> from unitconvert.geometrized import factorGeometrized
             >>> from astropy import units as u
             >>> factorGeometrized(1*u.kg)
-            {'c': 2, 'G': -1 }
+            {'c': 2.0, 'G': -1.0}
     """
-    dimdict = getdim(q.si)
-    a = dimdict[u.kg]
-    b = dimdict[u.m]
-    c = dimdict[u.s]
-    d = dimdict[u.A]
-    e = dimdict[u.K]
-    factorlist = {"c": 2 * a - c, "G": -a}
-    return factorlist
+    return GEOMETRIZED.factor(q)
 
 
-def toGeometrized(q):
+@instrumented
+def toGeometrized(q, inplace=False):
     """
     Convert the given astropy quantity `q` in SI units to Geometrized units
 
     Args :
             **q (astropy quantity)** : the quantity which needs to be converted
 
+            **inplace (bool)** : rescale the buffer of `q`, which must hold floats, instead of copying it. `q` is overwritten and shares its memory with the result
+
     Returns :
             **(astropy quantity)** : the input quantity `q` in geometrized units
 
@@ -45,26 +46,14 @@ def toGeometrized(q):
             >>> toGeometrized(1*u.kg)
             <Quantity 7.42616027e-28 m>
     """
-    q = q.si
-    dimdict = getdim(q)
-    a = dimdict[u.kg]
-    b = dimdict[u.m]
-    c = dimdict[u.s]
-    d = dimdict[u.A]
-    e = dimdict[u.K]
-    f = dimdict[u.cd]
-    g = dimdict[u.mol]
-    h = dimdict[u.rad]
-    factor = factor = acon.c ** (2 * a - c) * acon.G ** (-a)
-    natqu = q / factor
-    lendim = getdim(natqu)[u.m]
     try:
-        return natqu.to(u.m**lendim * u.A**d * u.K**e * u.cd**f * u.mol**g * u.rad**h)
-    except:
+        return GEOMETRIZED.convert(q, inplace=inplace)
+    except u.UnitConversionError:
         return "Cannot Convert"
 
 
-def fromGeometrized(q, finalUnits):
+@instrumented
+def fromGeometrized(q, finalUnits, inplace=False):
     """
     Convert the given astropy quantity `q` in geometrized units to SI units
 
@@ -75,6 +64,8 @@ def fromGeometrized(q, finalUnits):
 
             For instance both `meters` and `seconds` have the same units `eV` in Geometrized units. Therefore we need to specify the SI unit to which we need to convert it back to.
 
+            **inplace (bool)** : rescale the buffer of `q`, which must hold floats, instead of copying it. `q` is overwritten and shares its memory with the result
+
     Returns :
             **(astropy quantity)** : the input quantity `q` in SI units
 
@@ -84,9 +75,84 @@ def fromGeometrized(q, finalUnits):
             >>> fromGeometrized(7.42616027e-28*u.m,u.kg)
             <Quantity 1. kg>
     """
-    fac = factorGeometrized(finalUnits)
-    factor = acon.c ** (fac["c"]) * acon.G ** (fac["G"])
     try:
-        return (q * factor).to(finalUnits)
-    except:
+        return GEOMETRIZED.convertback(q, finalUnits, inplace=inplace)
+    except u.UnitConversionError:
         return "Cannot convert"
+
+
+@instrumented
+def reverse_converter(finalUnits):
+    """
+    Compile the conversion of quantities in Geometrized units to `finalUnits` once, for repeated use.
+    Unlike :func:`fromGeometrized`, the returned callable raises `astropy.units.UnitConversionError` for quantities
+    of other dimensions instead of returning a string.
+
+    Args :
+            **finalUnits (astropy unit)** : the units to which quantities are converted
+
+    Returns :
+            **(ConversionPlan)** : a vectorized callable converting quantities, or raw values expressed in `plan(finalUnits).target`, to `finalUnits`
+
+    Example :
+            >>> from unitconvert.geometrized import reverse_converter
+            >>> from astropy import units as u
+            >>> toKilograms = reverse_converter(u.kg)
+            >>> toKilograms([7.42616027e-28, 1e-27] * u.m)
+            <Quantity [1.        , 1.34659092] kg>
+    """
+    return GEOMETRIZED.reverse_converter(finalUnits)
+
+
+@instrumented
+def plan(unit):
+    """
+    Compile the conversion of values given in `unit` to Geometrized units. Plans are cached per input unit,
+    so converting many arrays that share a unit costs a single multiplication each.
+
+    Args :
+            **unit (astropy unit)** : the unit of the values that need to be converted
+
+    Returns :
+            **(ConversionPlan)** : a callable that converts values or quantities given in `unit` to Geometrized units
+
+    Example :
+            >>> from unitconvert.geometrized import plan
+            >>> from astropy import units as u
+            >>> plan(u.kg)
+            <ConversionPlan kg -> 7.426160269118665e-28 m>
+    """
+    return GEOMETRIZED.plan(unit)
+
+
+@instrumented
+def toGeometrizedTable(table):
+    """
+    Convert all the columns of `table` to Geometrized units in one call. Columns sharing a unit share one conversion factor.
+
+    Args :
+            **table (dict or astropy QTable)** : a mapping of column names to astropy quantities
+
+    Returns :
+            **(dict or astropy QTable)** : the converted columns, of the same kind as `table`
+    """
+    return convert_columns(table, plan)
+
+
+@instrumented
+def toGeometrizedValues(values, unit, out=None):
+    """
+    Convert raw values given in `unit` to Geometrized units without going through astropy quantities.
+    The conversion factor is computed once per unit and applied with a single multiplication.
+
+    Args :
+            **values (array_like)** : the values which need to be converted, expressed in `unit`
+
+            **unit (astropy unit)** : the unit of `values`
+
+            **out (numpy array)** : optional buffer receiving the result, which may be `values` itself
+
+    Returns :
+            **(numpy array)** : the converted values, expressed in `plan(unit).target`
+    """
+    return plan(unit).apply(values, out=out)
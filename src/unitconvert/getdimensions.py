@@ -1,12 +1,165 @@
-from collections import defaultdict
+from functools import lru_cache
+from numbers import Integral
+from unitconvert._lazy import u
+from unitconvert import defaults
+from unitconvert.rational import inverse, matvec
+
+#: Maximum number of distinct units whose SI decomposition is memoized.
+CACHE_SIZE = 1024
+#: Number of leading dimensions of :data:`unitconvert.defaults.si` (mass, length, time, temperature, current) that unit systems rescale.
+NCORE = 5
+#: Symbols of the SI base units, in the order of :data:`unitconvert.defaults.si` and of :class:`Dimension`.
+NAMES = ("kg", "m", "s", "K", "A", "mol", "cd", "rad")
+
+
+class Dimension(tuple):
+    """
+    The exponents of the SI base units of a quantity, ordered as in :data:`unitconvert.defaults.si`.
+    It is an immutable tuple, hence hashable and usable as a cache key, with vector addition, subtraction and scaling.
+    Indexing by an SI base unit, as in `dim[u.kg]`, is supported as well.
+
+    Example :
+            >>> from unitconvert.getdimensions import getdim
+            >>> from astropy import units as u
+            >>> speed = getdim(u.km / u.s)
+            >>> speed
+            Dimension(m=1, s=-1)
+            >>> speed + getdim(u.s) == getdim(u.m)
+            True
+            >>> (2 * speed)[u.s]
+            -2
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, exponents=(0,) * len(NAMES)):
+        self = tuple.__new__(cls, exponents)
+        if len(self) != len(NAMES):
+            raise ValueError(f"A Dimension has {len(NAMES)} exponents, got {len(self)}")
+        return self
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, slice, Integral)):
+            return tuple.__getitem__(self, key)
+        index = _index().get(key)
+        return 0 if index is None else tuple.__getitem__(self, index)
+
+    def __add__(self, other):
+        return Dimension([a + b for a, b in zip(self, other)])
+
+    def __sub__(self, other):
+        return Dimension([a - b for a, b in zip(self, other)])
+
+    def __neg__(self):
+        return Dimension([-a for a in self])
+
+    def __mul__(self, factor):
+        return Dimension([a * factor for a in self])
+
+    __rmul__ = __mul__
+
+    def __repr__(self):
+        return "Dimension(" + ", ".join(f"{n}={p}" for n, p in zip(NAMES, self) if p != 0) + ")"
+
+    def items(self):
+        """
+        Pairs of SI base units and nonzero exponents
+        """
+        return [(base, p) for base, p in zip(defaults.si, self) if p != 0]
+
+    def keys(self):
+        """
+        The SI base units with a nonzero exponent
+        """
+        return [base for base, p in zip(defaults.si, self) if p != 0]
+
+
+@lru_cache(maxsize=1)
+def _index():
+    return {base: i for i, base in enumerate(defaults.si)}
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _decompose(unit):
+    unit = unit.si.decompose()
+    powers = dict(zip(unit.bases, unit.powers))
+    return Dimension([powers.get(i, 0) for i in defaults.si]), unit.scale
+
+
+def _unit(q):
+    if isinstance(q, u.UnitBase):
+        return q
+    return q.unit
+
+
+def dimsignature(q):
+    """
+    Find the dimension signature of the given quantity or unit.
+    The result only depends on the unit of `q` and is memoized, so repeated calls for the same unit are cheap.
+
+    Args :
+            **q (astropy quantity or unit)** : the quantity for which the dimensions are required
+
+    Returns :
+            **(tuple)** : a pair made of the :class:`Dimension` of `q` and the SI scale of its unit
+
+    Example :
+            >>> from unitconvert.getdimensions import dimsignature
+            >>> from astropy import units as u
+            >>> dimsignature(u.km / u.s)
+            (Dimension(m=1, s=-1), 1000.0)
+    """
+    return _decompose(_unit(q))
 
 
 def getdim(q):
-    q = q.si.decompose()
-    q = q * 1
-    sb = q.unit.bases
-    sp = q.unit.powers
-    dictdim = defaultdict(lambda: 0)
-    for i in range(len(sb)):
-        dictdim[sb[i]] = sp[i]
-    return dictdim
+    """
+    Find the SI dimensions of the given quantity or unit, see :class:`Dimension`. The result is memoized per unit.
+    """
+    return _decompose(_unit(q))[0]
+
+
+def dimension_solver(basis):
+    """
+    Build an exact solver expressing dimensions in terms of the quantities returned by `basis`.
+    The dimension matrix is inverted with fractions on first use, and solutions are cached per dimension.
+
+    Args :
+            **basis (function)** : a function returning :data:`NCORE` quantities or units whose dimensions span mass, length, time, temperature and current
+
+    Returns :
+            **(function)** : a function mapping a tuple of SI exponents, as given by :func:`dimsignature`, to the tuple of
+            exact exponents of the elements of `basis` whose product has these dimensions
+
+    Example :
+            >>> from unitconvert.getdimensions import dimension_solver, dimsignature
+            >>> from astropy import units as u
+            >>> solve = dimension_solver(lambda: [u.kg, u.m / u.s, u.s, u.K, u.A])
+            >>> solve(dimsignature(u.m)[0])
+            (Fraction(0, 1), Fraction(1, 1), Fraction(1, 1), Fraction(0, 1), Fraction(0, 1))
+    """
+
+    @lru_cache(maxsize=1)
+    def solution():
+        columns = [dimsignature(i)[0][:NCORE] for i in basis()]
+        return inverse(list(zip(*columns)))
+
+    @lru_cache(maxsize=CACHE_SIZE)
+    def solve(dims):
+        return matvec(solution(), dims[:NCORE])
+
+    return solve
+
+
+def cache_info():
+    """
+    Hit/miss statistics of the memoized SI decompositions used by :func:`getdim` and :func:`dimsignature`
+    """
+    return _decompose.cache_info()
+
+
+def cache_clear():
+    """
+    Empty the memoized SI decompositions used by :func:`getdim` and :func:`dimsignature`
+    """
+    _decompose.cache_clear()
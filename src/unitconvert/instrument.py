@@ -0,0 +1,293 @@
+"""
+Opt-in instrumentation of the public conversion functions.
+
+Call counts, cumulative and own time, and the sizes of the converted arrays are recorded for every function decorated
+with :func:`instrumented`, together with the hit rates of the internal caches. Recording is off by default, in which case
+a decorated function only pays for one extra call and a flag check. Besides the module level caches of :data:`CACHES`,
+the factor caches of the custom unit systems and the lookup tables of :class:`unitconvert.custom.UnitSystem` objects are
+reported while they are alive, see :func:`register_cache`. Turn it on with :func:`profile`, :func:`enable`,
+or by setting the environment variable :data:`ENV_VAR` before importing unitconvert::
+
+    UNITCONVERT_PROFILE=1 python script.py            # print a summary at exit
+    UNITCONVERT_PROFILE=report.json python script.py  # write a JSON report at exit
+    UNITCONVERT_PROFILE=report.prof python script.py  # write pstats data at exit
+"""
+
+import atexit
+import json
+import marshal
+import os
+import sys
+import threading
+import weakref
+from contextlib import contextmanager
+from functools import wraps
+from importlib import import_module
+from time import perf_counter
+
+#: Environment variable that enables the instrumentation when unitconvert is imported.
+ENV_VAR = "UNITCONVERT_PROFILE"
+
+#: Internal caches whose hit rates are reported, as the module and the attribute path of their `cache_info` function.
+CACHES = {
+    "getdimensions.dimsignature": ("unitconvert.getdimensions", "cache_info"),
+    "rational.inverse": ("unitconvert.rational", "_inverse.cache_info"),
+    "natural.plan": ("unitconvert.natural", "NATURAL.plan_cache_info"),
+    "planck.plan": ("unitconvert.planck", "PLANCK.plan_cache_info"),
+    "gaussian.plan": ("unitconvert.gaussian", "GAUSSIAN.plan_cache_info"),
+    "geometrized.plan": ("unitconvert.geometrized", "GEOMETRIZED.plan_cache_info"),
+    "gadget.plan": ("unitconvert.gadget", "_plan.cache_info"),
+    "gadget.fromGadget": ("unitconvert.gadget", "_reverse_plan.cache_info"),
+    "unitsystem.toSystem": ("unitconvert.unitsystem", "_target_system.cache_info"),
+}
+
+_enabled = False
+_functions = {}
+_baseline = {}
+_local = threading.local()
+# Serializes the updates of the counters by calls running in different threads
+_lock = threading.Lock()
+# Caches built at run time, such as those of the custom unit systems, with their labels
+_registered = weakref.WeakKeyDictionary()
+
+
+class FunctionStats:
+    """
+    The counters of one instrumented function
+    """
+
+    __slots__ = ("name", "code", "calls", "time", "own", "values", "largest")
+
+    def __init__(self, name, code):
+        self.name = name
+        self.code = code
+        self.reset()
+
+    def reset(self):
+        self.calls = 0
+        self.time = 0.0
+        self.own = 0.0
+        self.values = 0
+        self.largest = 0
+
+    def record(self, elapsed, own, size):
+        self.calls += 1
+        self.time += elapsed
+        self.own += own
+        if size is not None:
+            self.values += size
+            self.largest = max(self.largest, size)
+
+    def as_dict(self):
+        return {
+            "calls": self.calls,
+            "time": self.time,
+            "own_time": self.own,
+            "time_per_call": self.time / self.calls if self.calls else 0.0,
+            "values": self.values,
+            "largest": self.largest,
+        }
+
+
+def _size(args):
+    for arg in args:
+        if hasattr(arg, "shape"):
+            return int(getattr(arg, "size", 1))
+    return None
+
+
+def _call(stats, func, args, kwargs):
+    stack = _local.__dict__.setdefault("stack", [])
+    stack.append(0.0)
+    start = perf_counter()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        elapsed = perf_counter() - start
+        inner = stack.pop()
+        if stack:
+            stack[-1] += elapsed
+        size = _size(args)
+        with _lock:
+            stats.record(elapsed, elapsed - inner, size)
+
+
+def instrumented(func):
+    """
+    Decorate a public function so that its calls are recorded while the instrumentation is enabled
+    """
+    name = f"{func.__module__.rpartition('.')[2]}.{func.__qualname__.rpartition('<locals>.')[2]}"
+    stats = _functions.setdefault(name, FunctionStats(name, func.__code__))
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _enabled:
+            return func(*args, **kwargs)
+        return _call(stats, func, args, kwargs)
+
+    return wrapper
+
+
+def register_cache(label, cache):
+    """
+    Report the hits and misses of `cache`, an object with a `cache_info()` method such as an `lru_cache`, under `label`.
+    The cache is only weakly referenced, and the counts of the caches sharing a label are added up.
+    """
+    with _lock:
+        _registered[cache] = label
+
+
+def _cache_counts():
+    counts = {}
+    for label, (module, path) in CACHES.items():
+        if module not in sys.modules:
+            continue
+        obj = import_module(module)
+        try:
+            for attr in path.split("."):
+                obj = getattr(obj, attr)
+            info = obj()
+        except AttributeError:
+            continue
+        counts[label] = (info.hits, info.misses)
+    with _lock:
+        registered = list(_registered.items())
+    for cache, label in registered:
+        info = cache.cache_info()
+        hits, misses = counts.get(label, (0, 0))
+        counts[label] = (hits + info.hits, misses + info.misses)
+    return counts
+
+
+def reset():
+    """
+    Zero all the counters
+    """
+    global _baseline
+    with _lock:
+        for stats in _functions.values():
+            stats.reset()
+    _baseline = _cache_counts()
+
+
+def enable(clear=True):
+    """
+    Start recording, after zeroing the counters unless `clear` is False
+    """
+    global _enabled
+    if clear:
+        reset()
+    _enabled = True
+
+
+def disable():
+    """
+    Stop recording. The counters are kept until the next :func:`reset`.
+    """
+    global _enabled
+    _enabled = False
+
+
+def is_enabled():
+    """
+    Whether calls are currently recorded
+    """
+    return _enabled
+
+
+@contextmanager
+def profile(clear=True):
+    """
+    Record the calls made inside a `with` block.
+
+    Example :
+            >>> from astropy import units as u
+            >>> from unitconvert import instrument
+            >>> from unitconvert.natural import toNatural
+            >>> with instrument.profile():
+            ...     for i in range(100):
+            ...         _ = toNatural(i * u.m)
+            >>> print(instrument.summary())
+    """
+    previous = _enabled
+    enable(clear)
+    try:
+        yield
+    finally:
+        if not previous:
+            disable()
+
+
+def report():
+    """
+    Returns :
+            **(dictionary)** : the counters of every called function, keyed by `module.function`, and the hits, misses
+            and hit rate of every cache since the counters were last zeroed
+    """
+    functions = {
+        name: stats.as_dict() for name, stats in sorted(_functions.items()) if stats.calls
+    }
+    caches = {}
+    for label, (hits, misses) in _cache_counts().items():
+        hits0, misses0 = _baseline.get(label, (0, 0))
+        # Caches that were garbage collected since the reset can make the differences negative
+        hits, misses = max(hits - hits0, 0), max(misses - misses0, 0)
+        if hits or misses:
+            caches[label] = {"hits": hits, "misses": misses, "hit_rate": hits / (hits + misses)}
+    return {"functions": functions, "caches": caches}
+
+
+def summary():
+    """
+    Returns :
+            **(str)** : a table of the counters of :func:`report`
+    """
+    data = report()
+    lines = [f"{'function':<36}{'calls':>9}{'total [s]':>12}{'own [s]':>12}{'per call [s]':>14}{'values':>12}"]
+    for name, row in data["functions"].items():
+        lines.append(
+            f"{name:<36}{row['calls']:>9}{row['time']:>12.4e}{row['own_time']:>12.4e}"
+            f"{row['time_per_call']:>14.4e}{row['values']:>12}"
+        )
+    lines.append("")
+    lines.append(f"{'cache':<36}{'hits':>9}{'misses':>12}{'hit rate':>12}")
+    for label, row in data["caches"].items():
+        lines.append(f"{label:<36}{row['hits']:>9}{row['misses']:>12}{row['hit_rate']:>12.1%}")
+    return "\n".join(lines)
+
+
+def dump_json(path):
+    """
+    Write :func:`report` to `path` as JSON
+    """
+    with open(path, "w") as f:
+        json.dump(report(), f, indent=2)
+
+
+def dump_stats(path):
+    """
+    Write the function counters to `path` in the format of :meth:`cProfile.Profile.dump_stats`,
+    so that they can be read with :class:`pstats.Stats` or tools such as snakeviz
+    """
+    stats = {}
+    for entry in _functions.values():
+        if entry.calls:
+            code = entry.code
+            key = (code.co_filename, code.co_firstlineno, entry.name)
+            stats[key] = (entry.calls, entry.calls, entry.own, entry.time, {})
+    with open(path, "wb") as f:
+        marshal.dump(stats, f)
+
+
+def _dump_at_exit(target):
+    if target.endswith(".json"):
+        dump_json(target)
+    elif target.endswith((".prof", ".pstats")):
+        dump_stats(target)
+    else:
+        print(summary(), file=sys.stderr)
+
+
+if os.environ.get(ENV_VAR, "") not in ("", "0"):
+    enable()
+    atexit.register(_dump_at_exit, os.environ[ENV_VAR])
@@ -1,9 +1,17 @@
-from unitconvert.getdimensions import *
-import astropy.units as u
-import astropy.constants as acon
-from collections import defaultdict
+from unitconvert._lazy import u
+from unitconvert.instrument import instrumented
+from unitconvert.plan import convert_columns
+from unitconvert.compiler import CompiledSystem
 
+#: Natural units, where :math:`\hbar = c = k_B = \epsilon_0 = 1` and the remaining dimension is a power of eV
+NATURAL = CompiledSystem(
+    "Natural",
+    {"hbar": "hbar", "c": "c", "k_B": "k_B", "eps0": "eps0"},
+    ["eV"],
+)
 
+
+@instrumented
 def factorNatural(q):
     """
     Find the conversion factor that is used to convert the given quantity q to and from Natural units and SI units
@@ -18,30 +26,21 @@ def factorNatural(q):
             >>> from unitconvert.natural import factorNatural
             >>> from astropy import units as u
             >>> factorNatural(1*u.m)
-            {'hbar': 1.0, 'c': 1.0, 'k_B': 0, 'eps0': 0.0}
+            {'hbar': 1.0, 'c': 1.0, 'k_B': 0.0, 'eps0': 0.0}
     """
-    dimdict = getdim(q.si)
-    a = dimdict[u.kg]
-    b = dimdict[u.m]
-    c = dimdict[u.s]
-    d = dimdict[u.A]
-    e = dimdict[u.K]
-    factorlist = {
-        "hbar": 1 / 2 * (2 * b + 2 * c - d),
-        "c": 1 / 2 * (-4 * a + 2 * b + d),
-        "k_B": -e,
-        "eps0": d / 2,
-    }
-    return factorlist
-
-
-def toNatural(q):
+    return NATURAL.factor(q)
+
+
+@instrumented
+def toNatural(q, inplace=False):
     """
     Convert the given astropy quantity `q` in SI units to Natural units
 
     Args :
             **q (astropy quantity)** : the quantity which needs to be converted
 
+            **inplace (bool)** : rescale the buffer of `q`, which must hold floats, instead of copying it. `q` is overwritten and shares its memory with the result
+
     Returns :
             **(astropy quantity)** : the input quantity `q` in natural units
 
@@ -51,31 +50,14 @@ def toNatural(q):
             >>> toNatural(1*u.m)
             <Quantity 5067730.7161564 1 / eV>
     """
-    q = q.si
-    dimdict = getdim(q)
-    a = dimdict[u.kg]
-    b = dimdict[u.m]
-    c = dimdict[u.s]
-    d = dimdict[u.A]
-    e = dimdict[u.K]
-    f = dimdict[u.cd]
-    g = dimdict[u.mol]
-    h = dimdict[u.rad]
-    factor = (
-        acon.hbar ** (1 / 2 * (2 * b + 2 * c - d))
-        * acon.c ** (1 / 2 * (-4 * a + 2 * b + d))
-        * acon.k_B ** (-e)
-        * acon.eps0 ** (d / 2)
-    )
-    natqu = q / factor
-    massdim = getdim(natqu)[u.kg]
     try:
-        return natqu.to(u.eV**massdim * u.cd**f * u.mol**g * u.rad**h)
-    except:
-        return q
+        return NATURAL.convert(q, inplace=inplace)
+    except u.UnitConversionError:
+        return q.si
 
 
-def fromNatural(q, finalUnits):
+@instrumented
+def fromNatural(q, finalUnits, inplace=False):
     """
     Convert the given astropy quantity `q` in natural units to SI units
 
@@ -86,6 +68,8 @@ def fromNatural(q, finalUnits):
 
             For instance both `meters` and `seconds` have the same units `eV` in Natural units. Therefore we need to specify the SI unit to which we need to convert it back to.
 
+            **inplace (bool)** : rescale the buffer of `q`, which must hold floats, instead of copying it. `q` is overwritten and shares its memory with the result
+
     Returns :
             **(astropy quantity)** : the input quantity `q` in SI units
 
@@ -95,14 +79,84 @@ def fromNatural(q, finalUnits):
             >>> fromNatural(5067730.7161564/u.eV,u.m)
             <Quantity 1. m>
     """
-    fac = factorNatural(finalUnits)
-    factor = (
-        acon.hbar ** (fac["hbar"])
-        * acon.c ** (fac["c"])
-        * acon.k_B ** (fac["k_B"])
-        * acon.eps0 ** (fac["eps0"])
-    )
     try:
-        return (q * factor).to(finalUnits)
-    except:
+        return NATURAL.convertback(q, finalUnits, inplace=inplace)
+    except u.UnitConversionError:
         return "Cannot convert"
+
+
+@instrumented
+def reverse_converter(finalUnits):
+    """
+    Compile the conversion of quantities in Natural units to `finalUnits` once, for repeated use.
+    Unlike :func:`fromNatural`, the returned callable raises `astropy.units.UnitConversionError` for quantities
+    of other dimensions instead of returning a string.
+
+    Args :
+            **finalUnits (astropy unit)** : the units to which quantities are converted
+
+    Returns :
+            **(ConversionPlan)** : a vectorized callable converting quantities, or raw values expressed in `plan(finalUnits).target`, to `finalUnits`
+
+    Example :
+            >>> from unitconvert.natural import reverse_converter
+            >>> from astropy import units as u
+            >>> toMeters = reverse_converter(u.m)
+            >>> toMeters([5067730.7161564, 1e7] / u.eV)
+            <Quantity [1.       , 1.9732698] m>
+    """
+    return NATURAL.reverse_converter(finalUnits)
+
+
+@instrumented
+def plan(unit):
+    """
+    Compile the conversion of values given in `unit` to Natural units. Plans are cached per input unit,
+    so converting many arrays that share a unit costs a single multiplication each.
+
+    Args :
+            **unit (astropy unit)** : the unit of the values that need to be converted
+
+    Returns :
+            **(ConversionPlan)** : a callable that converts values or quantities given in `unit` to Natural units
+
+    Example :
+            >>> from unitconvert.natural import plan
+            >>> from astropy import units as u
+            >>> plan(u.m)
+            <ConversionPlan m -> 5067730.716156395 1 / eV>
+    """
+    return NATURAL.plan(unit)
+
+
+@instrumented
+def toNaturalTable(table):
+    """
+    Convert all the columns of `table` to Natural units in one call. Columns sharing a unit share one conversion factor.
+
+    Args :
+            **table (dict or astropy QTable)** : a mapping of column names to astropy quantities
+
+    Returns :
+            **(dict or astropy QTable)** : the converted columns, of the same kind as `table`
+    """
+    return convert_columns(table, plan)
+
+
+@instrumented
+def toNaturalValues(values, unit, out=None):
+    """
+    Convert raw values given in `unit` to Natural units without going through astropy quantities.
+    The conversion factor is computed once per unit and applied with a single multiplication.
+
+    Args :
+            **values (array_like)** : the values which need to be converted, expressed in `unit`
+
+            **unit (astropy unit)** : the unit of `values`
+
+            **out (numpy array)** : optional buffer receiving the result, which may be `values` itself
+
+    Returns :
+            **(numpy array)** : the converted values, expressed in `plan(unit).target`
+    """
+    return plan(unit).apply(values, out=out)
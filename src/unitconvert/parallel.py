@@ -0,0 +1,128 @@
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from os import cpu_count
+from os.path import basename, join as joinpath
+import astropy.units as u
+import numpy as np
+from unitconvert.plan import get_planner
+from unitconvert.stream import CHUNKSIZE
+
+
+def _shards(n, workers):
+    step = -(-n // workers)
+    return [(start, min(start + step, n)) for start in range(0, n, step)]
+
+
+def _scale_shared(src, dst, shape, dtype, start, stop, scale):
+    inp = shared_memory.SharedMemory(name=src)
+    out = shared_memory.SharedMemory(name=dst)
+    try:
+        a = np.ndarray(shape, dtype, buffer=inp.buf)
+        b = np.ndarray(shape, np.float64, buffer=out.buf)
+        np.multiply(a[start:stop], scale, out=b[start:stop])
+        del a, b
+    finally:
+        inp.close()
+        out.close()
+
+
+def _scale_file(src, dst, scale, chunksize):
+    inp = np.load(src, mmap_mode="r")
+    out = np.lib.format.open_memmap(dst, mode="w+", dtype=np.float64, shape=inp.shape)
+    for start in range(0, len(inp), chunksize):
+        stop = start + chunksize
+        np.multiply(inp[start:stop], scale, out=out[start:stop])
+    out.flush()
+    return dst
+
+
+def convert_array(values, unit, system, workers=None):
+    """
+    Convert a large array given in `unit` to `system` using several processes.
+    The array is placed in shared memory and each worker rescales its own slice of it, so the data is never pickled.
+    The conversion factor is compiled once in the calling process, therefore any system accepted by
+    :func:`unitconvert.plan.get_planner` works, including the functions returned by :func:`unitconvert.custom.load_units`.
+
+    Args :
+            **values (array_like or astropy quantity)** : the values which need to be converted
+
+            **unit (astropy unit)** : the unit of `values`
+
+            **system** : the target unit system, see :func:`unitconvert.plan.get_planner`
+
+            **workers (int)** : the number of processes, defaults to the number of cores
+
+    Returns :
+            **(astropy quantity)** : the converted values
+    """
+    plan = get_planner(system)(unit)
+    if isinstance(values, u.Quantity):
+        values = values.to_value(plan.unit)
+    values = np.ascontiguousarray(values)
+    workers = workers or cpu_count()
+    if values.ndim == 0 or values.size == 0:
+        return plan(values)
+    inp = shared_memory.SharedMemory(create=True, size=values.nbytes)
+    out = shared_memory.SharedMemory(create=True, size=values.size * 8)
+    try:
+        np.ndarray(values.shape, values.dtype, buffer=inp.buf)[...] = values
+        with ProcessPoolExecutor(workers) as pool:
+            futures = [
+                pool.submit(
+                    _scale_shared,
+                    inp.name,
+                    out.name,
+                    values.shape,
+                    values.dtype,
+                    start,
+                    stop,
+                    plan.scale,
+                )
+                for start, stop in _shards(len(values), workers)
+            ]
+            for future in futures:
+                future.result()
+        result = np.ndarray(values.shape, np.float64, buffer=out.buf).copy()
+    finally:
+        inp.close()
+        inp.unlink()
+        out.close()
+        out.unlink()
+    return result << plan.target
+
+
+def convert_files(paths, unit, system, outdir, workers=None, chunksize=CHUNKSIZE):
+    """
+    Convert a list of `.npy` files holding values in `unit` to `system`, one file per process.
+    Files are read and written through memory maps, `chunksize` rows at a time.
+
+    Args :
+            **paths (list)** : the paths of the `.npy` files
+
+            **unit (astropy unit)** : the unit of the values stored in the files
+
+            **system** : the target unit system, see :func:`unitconvert.plan.get_planner`
+
+            **outdir (str)** : the directory in which the converted files are written under their original names
+
+            **workers (int)** : the number of processes, defaults to the number of cores
+
+            **chunksize (int)** : number of rows converted at once
+
+    Returns :
+            **(tuple)** : the list of written paths, and the unit of the values stored in them
+    """
+    plan = get_planner(system)(unit)
+    with ProcessPoolExecutor(workers or cpu_count()) as pool:
+        futures = [
+            pool.submit(
+                _scale_file,
+                path,
+                joinpath(outdir, basename(path)),
+                plan.scale,
+                chunksize,
+            )
+            for path in paths
+        ]
+        written = [future.result() for future in futures]
+    return written, plan.target
@@ -0,0 +1,208 @@
+from functools import lru_cache
+from importlib import import_module
+from unitconvert._lazy import u, acon, np
+from unitconvert.daskarray import LazyQuantity, is_lazy, rescale
+
+#: Maximum number of input units for which a plan is kept per unit system.
+PLAN_CACHE_SIZE = 256
+#: Names of the built-in unit systems accepted by :func:`get_planner`.
+SYSTEMS = ("natural", "planck", "gaussian", "geometrized", "gadget")
+
+
+class ConversionPlan:
+    """
+    A precompiled conversion from one input unit to a unit system.
+    The whole conversion is reduced to a single float scale factor and the target unit.
+    Plans are immutable, so one plan can be shared by any number of threads. Arrays are converted by a single
+    NumPy multiplication, which releases the GIL, so conversions running in several threads proceed in parallel.
+
+    Args :
+            **unit (astropy unit)** : the unit of the values that the plan accepts
+
+            **scale (float)** : the factor by which values given in `unit` are multiplied
+
+            **target (astropy unit)** : the unit of the converted values
+
+    Example :
+            >>> from unitconvert.natural import plan
+            >>> from astropy import units as u
+            >>> p = plan(u.m)
+            >>> p([1.0, 2.0])
+            <Quantity [ 5067730.7161564 , 10135461.43231279] 1 / eV>
+    """
+
+    __slots__ = ("unit", "scale", "target")
+
+    def __init__(self, unit, scale, target):
+        self.unit = unit
+        self.scale = scale
+        self.target = target
+
+    def __call__(self, values, inplace=False):
+        """
+        Convert `values` given in the input unit of the plan. Quantities are first expressed in that unit.
+        Chunked arrays such as dask arrays, bare or wrapped in a :class:`unitconvert.daskarray.LazyQuantity`,
+        are converted lazily and returned as a :class:`unitconvert.daskarray.LazyQuantity`.
+        With `inplace=True` the buffer of `values` is rescaled and returned with the target unit, see :func:`rescale_inplace`.
+        """
+        if isinstance(values, LazyQuantity):
+            values = values.to(self.unit).value
+        if is_lazy(values):
+            return LazyQuantity(rescale(values, self.scale), self.target)
+        if inplace:
+            # Constants and read-only buffers are refused before the units are checked
+            _inplace_view(values)
+        scale = self.scale
+        if isinstance(values, u.Quantity):
+            # The change to the input unit is folded into the scale, so the values are only read once
+            scale = scale * values.unit.to(self.unit)
+            if inplace:
+                return rescale_inplace(values, scale, self.target)
+            values = values.view(np.ndarray)
+        elif inplace:
+            return rescale_inplace(values, scale, self.target)
+        return np.multiply(values, scale) << self.target
+
+    def apply(self, values, out=None):
+        """
+        Convert raw `values` given in the input unit of the plan and return the raw converted values.
+        When `out` is given the result is written into it and no intermediate array is allocated.
+        `out` may be `values` itself to convert in place.
+        """
+        return np.multiply(values, self.scale, out=out)
+
+    def inverse(self):
+        """
+        The plan converting values expressed in the target unit back to the input unit of this plan
+        """
+        return ConversionPlan(self.target, 1.0 / self.scale, self.unit)
+
+    def __repr__(self):
+        return f"<ConversionPlan {self.unit} -> {self.scale!r} {self.target}".rstrip() + ">"
+
+
+def rescale_inplace(values, scale, unit):
+    """
+    Multiply the buffer of the floating point array or quantity `values` by `scale` in place, without any temporary array,
+    and return it labelled with `unit`. The result shares its memory with `values`, whose content is overwritten.
+    Constants of `astropy.constants` and read-only buffers are refused with a `TypeError`.
+
+    Returns :
+            **(astropy quantity)** : a quantity in `unit` viewing the buffer of `values`
+    """
+    view = _inplace_view(values)
+    np.multiply(view, scale, out=view)
+    return view << unit
+
+
+def _inplace_view(values):
+    # The buffer of `values` as an array, if it may be overwritten
+    if isinstance(values, acon.Constant):
+        raise TypeError(f"Cannot convert the constant {values.name!r} in place")
+    view = values.view(np.ndarray) if isinstance(values, u.Quantity) else np.asarray(values)
+    if not np.issubdtype(view.dtype, np.floating):
+        raise TypeError(f"Converting in place needs a floating point array, got {view.dtype}")
+    if not view.flags.writeable:
+        raise TypeError("Converting in place needs a writeable array")
+    return view
+
+
+def compile_plan(converter, unit):
+    """
+    Build a :class:`ConversionPlan` for `unit` by running `converter` once on a unit quantity.
+
+    Args :
+            **converter (function)** : a function such as `toNatural` that converts an astropy quantity
+
+            **unit (astropy unit)** : the unit of the values that the plan accepts
+
+    Returns :
+            **(ConversionPlan)** : the compiled plan
+    """
+    unit = u.Unit(unit)
+    result = converter(1.0 * unit)
+    if not isinstance(result, u.Quantity):
+        raise u.UnitConversionError(f"Cannot convert '{unit}' with {converter.__name__}")
+    return ConversionPlan(unit, float(result.value), result.unit)
+
+
+def cached_planner(converter):
+    """
+    Wrap :func:`compile_plan` for `converter` in a bounded cache keyed by the input unit.
+    """
+
+    @lru_cache(maxsize=PLAN_CACHE_SIZE)
+    def planner(unit):
+        return compile_plan(converter, unit)
+
+    return planner
+
+
+def convert_columns(table, planner):
+    """
+    Convert every column of `table` with the plans returned by `planner`.
+    Columns are grouped by unit, so the conversion factor of each distinct unit is computed only once.
+    Columns that do not carry a unit are passed through unchanged.
+
+    Args :
+            **table (dict or astropy table)** : a mapping of column names to astropy quantities
+
+            **planner (function)** : a function returning a :class:`ConversionPlan` for a given unit, such as `unitconvert.natural.plan`
+
+    Returns :
+            **(dict or astropy QTable)** : the converted columns, as a QTable if `table` is a table and as a dictionary otherwise
+
+    Example :
+            >>> from unitconvert.plan import convert_columns
+            >>> from unitconvert.natural import plan
+            >>> from astropy import units as u
+            >>> convert_columns({"x": [1.0, 2.0] * u.m, "t": [1.0] * u.s}, plan)
+            {'x': <Quantity [ 5067730.7161564 , 10135461.43231279] 1 / eV>, 't': <Quantity [1.51926745e+15] 1 / eV>}
+    """
+    from astropy.table import QTable, Table
+
+    names = table.colnames if isinstance(table, Table) else list(table.keys())
+    groups = {}
+    for name in names:
+        unit = getattr(table[name], "unit", None)
+        if unit is not None:
+            groups.setdefault(unit, []).append(name)
+    converted = {name: table[name] for name in names}
+    for unit, group in groups.items():
+        p = planner(unit)
+        for name in group:
+            converted[name] = p(table[name].value)
+    if isinstance(table, Table):
+        return QTable(converted, meta=table.meta)
+    return converted
+
+
+def get_planner(system):
+    """
+    Find the function that returns conversion plans for `system`.
+
+    Args :
+            **system** : the name of a built-in unit system (`'natural'`, `'planck'`, `'gaussian'`, `'geometrized'`, `'gadget'`),
+            `'custom:<name>'` for a unit system saved with :func:`unitconvert.custom.create_units`,
+            a system module, a :class:`unitconvert.custom.UnitSystem`, or any function converting astropy quantities
+            such as the one returned by :func:`unitconvert.custom.load_units`
+
+    Returns :
+            **(function)** : a function returning a :class:`ConversionPlan` for a given unit
+    """
+    if isinstance(system, str) and system.startswith("custom:"):
+        from unitconvert.custom import load_units
+
+        loaded = load_units(system[len("custom:") :])
+        if loaded is None:
+            raise ValueError(f"Unknown custom unit system '{system[len('custom:') :]}'")
+        system = loaded[0]
+    elif isinstance(system, str):
+        if system not in SYSTEMS:
+            raise ValueError(f"Unknown unit system '{system}', expected one of {SYSTEMS}")
+        system = import_module("unitconvert." + system)
+    if hasattr(system, "plan"):
+        return system.plan
+    if callable(system):
+        return cached_planner(system)
+    raise TypeError(f"Cannot build conversion plans for {system!r}")
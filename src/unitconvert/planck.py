@@ -1,9 +1,16 @@
-from unitconvert.getdimensions import *
-import astropy.units as u
-import astropy.constants as acon
-from collections import defaultdict
+from unitconvert._lazy import u
+from unitconvert.instrument import instrumented
+from unitconvert.plan import convert_columns
+from unitconvert.compiler import CompiledSystem
 
+#: Planck units, where :math:`c = \hbar = G = k_B = \epsilon_0 = 1`
+PLANCK = CompiledSystem(
+    "Planck",
+    {"c": "c", "hbar": "hbar", "k_B": "k_B", "eps0": "eps0", "G": "G"},
+)
 
+
+@instrumented
 def factorPlanck(q):
     """
     Find the conversion factor that is used to convert the given quantity q to and from Planck units and SI units
@@ -18,31 +25,21 @@ def factorPlanck(q):
             >>> from unitconvert.planck import factorPlanck
             >>> from astropy import units as u
             >>> factorPlanck(1*u.m)
-            {'c': -1.5, 'hbar': 0.5, 'k_B': 0, 'eps0': 0.0, 'G': 0.5}
+            {'c': -1.5, 'hbar': 0.5, 'k_B': 0.0, 'eps0': 0.0, 'G': 0.5}
     """
-    dimdict = getdim(q.si)
-    a = dimdict[u.kg]
-    b = dimdict[u.m]
-    c = dimdict[u.s]
-    d = dimdict[u.A]
-    e = dimdict[u.K]
-    factorlist = {
-        "c": 1 / 2 * (a - 3 * b - 5 * c + 5 * e - 6 * d),
-        "hbar": 1 / 2 * (a + b + c + e),
-        "k_B": -e,
-        "eps0": d / 2,
-        "G": 1 / 2 * (-a + b + c - e - d),
-    }
-    return factorlist
-
-
-def toPlanck(q):
+    return PLANCK.factor(q)
+
+
+@instrumented
+def toPlanck(q, inplace=False):
     """
     Convert the given astropy quantity `q` in SI units to Planck units
 
     Args :
             **q (astropy quantity)** : the quantity which needs to be converted
 
+            **inplace (bool)** : rescale the buffer of `q`, which must hold floats, instead of copying it. `q` is overwritten and shares its memory with the result
+
     Returns :
             **(astropy quantity)** : the input quantity `q` in Planck units
 
@@ -52,38 +49,14 @@ def toPlanck(q):
             >>> toPlanck(1*u.m)
             <Quantity 6.18714241e+34>
     """
-    q = q.si
-    dimdict = getdim(q.si)
-    a = dimdict[u.kg]
-    b = dimdict[u.m]
-    c = dimdict[u.s]
-    d = dimdict[u.A]
-    e = dimdict[u.K]
-    f = dimdict[u.cd]
-    g = dimdict[u.mol]
-    h = dimdict[u.rad]
-    factorlist = {
-        "c": 1 / 2 * (a - 3 * b - 5 * c + 5 * e + 6 * d),
-        "hbar": 1 / 2 * (a + b + c + e),
-        "k_B": -e,
-        "eps0": d / 2,
-        "G": 1 / 2 * (-a + b + c - e - d),
-    }
-    factor = (
-        acon.c ** (1 / 2 * (a - 3 * b - 5 * c + 5 * e + 6 * d))
-        * acon.hbar ** (1 / 2 * (a + b + c + e))
-        * acon.k_B ** (-e)
-        * acon.eps0 ** (d / 2)
-        * acon.G ** (1 / 2 * (-a + b + c - e - d))
-    )
-    natqu = q / factor
     try:
-        return natqu.to(u.cd**f * u.mol**g * u.rad**h)
-    except:
+        return PLANCK.convert(q, inplace=inplace)
+    except u.UnitConversionError:
         return "Cannot Convert"
 
 
-def fromPlanck(q, finalUnits):
+@instrumented
+def fromPlanck(q, finalUnits, inplace=False):
     """
     Convert the given astropy quantity `q` in Planck units to SI units
 
@@ -94,6 +67,8 @@ def fromPlanck(q, finalUnits):
 
             All fundamental quantities are unit less in Planck units. Therefore we need to specify the SI unit to which we need to convert it back to.
 
+            **inplace (bool)** : rescale the buffer of `q`, which must hold floats, instead of copying it. `q` is overwritten and shares its memory with the result
+
     Returns :
             **(astropy quantity)** : the input quantity `q` in SI units
 
@@ -103,15 +78,84 @@ def fromPlanck(q, finalUnits):
             >>> fromPlanck(6.18714241e+34,u.m)
             <Quantity 1. m>
     """
-    fac = factorPlanck(finalUnits)
-    factor = (
-        acon.hbar ** (fac["hbar"])
-        * acon.c ** (fac["c"])
-        * acon.k_B ** (fac["k_B"])
-        * acon.eps0 ** (fac["eps0"])
-        * acon.G ** (fac["G"])
-    )
     try:
-        return (q * factor).to(finalUnits)
-    except:
+        return PLANCK.convertback(q, finalUnits, inplace=inplace)
+    except u.UnitConversionError:
         return "Cannot convert"
+
+
+@instrumented
+def reverse_converter(finalUnits):
+    """
+    Compile the conversion of quantities in Planck units to `finalUnits` once, for repeated use.
+    Unlike :func:`fromPlanck`, the returned callable raises `astropy.units.UnitConversionError` for quantities
+    of other dimensions instead of returning a string.
+
+    Args :
+            **finalUnits (astropy unit)** : the units to which quantities are converted
+
+    Returns :
+            **(ConversionPlan)** : a vectorized callable converting quantities, or raw values expressed in `plan(finalUnits).target`, to `finalUnits`
+
+    Example :
+            >>> from unitconvert.planck import reverse_converter
+            >>> from astropy import units as u
+            >>> toMeters = reverse_converter(u.m)
+            >>> toMeters([6.18714241e+34, 1e35])
+            <Quantity [1.        , 1.61625502] m>
+    """
+    return PLANCK.reverse_converter(finalUnits)
+
+
+@instrumented
+def plan(unit):
+    """
+    Compile the conversion of values given in `unit` to Planck units. Plans are cached per input unit,
+    so converting many arrays that share a unit costs a single multiplication each.
+
+    Args :
+            **unit (astropy unit)** : the unit of the values that need to be converted
+
+    Returns :
+            **(ConversionPlan)** : a callable that converts values or quantities given in `unit` to Planck units
+
+    Example :
+            >>> from unitconvert.planck import plan
+            >>> from astropy import units as u
+            >>> plan(u.m)
+            <ConversionPlan m -> 6.187142405676739e+34>
+    """
+    return PLANCK.plan(unit)
+
+
+@instrumented
+def toPlanckTable(table):
+    """
+    Convert all the columns of `table` to Planck units in one call. Columns sharing a unit share one conversion factor.
+
+    Args :
+            **table (dict or astropy QTable)** : a mapping of column names to astropy quantities
+
+    Returns :
+            **(dict or astropy QTable)** : the converted columns, of the same kind as `table`
+    """
+    return convert_columns(table, plan)
+
+
+@instrumented
+def toPlanckValues(values, unit, out=None):
+    """
+    Convert raw values given in `unit` to Planck units without going through astropy quantities.
+    The conversion factor is computed once per unit and applied with a single multiplication.
+
+    Args :
+            **values (array_like)** : the values which need to be converted, expressed in `unit`
+
+            **unit (astropy unit)** : the unit of `values`
+
+            **out (numpy array)** : optional buffer receiving the result, which may be `values` itself
+
+    Returns :
+            **(numpy array)** : the converted values, expressed in `plan(unit).target`
+    """
+    return plan(unit).apply(values, out=out)
@@ -0,0 +1,89 @@
+from fractions import Fraction
+from functools import lru_cache
+from math import sqrt
+from unitconvert._lazy import np
+
+#: Largest denominator used when a float exponent is turned into a fraction.
+MAX_DENOMINATOR = 1000
+
+
+class SingularMatrixError(ValueError):
+    """
+    Raised when a dimension matrix has no inverse.
+    """
+
+
+def as_fraction(x):
+    """
+    Convert the exponent `x` to an exact fraction. Floats such as `0.49999999` are rounded to the nearest fraction
+    whose denominator does not exceed :data:`MAX_DENOMINATOR`.
+    """
+    if isinstance(x, (int, Fraction)):
+        return Fraction(x)
+    return Fraction(float(x)).limit_denominator(MAX_DENOMINATOR)
+
+
+def inverse(matrix):
+    """
+    Invert a square matrix exactly using fractions. Results are cached per matrix.
+
+    Args :
+            **matrix (list)** : a list of rows of integer, fractional or float entries
+
+    Returns :
+            **(tuple)** : the rows of the inverse matrix, with :class:`fractions.Fraction` entries
+
+    Example :
+            >>> from unitconvert.rational import inverse
+            >>> inverse([[2, 0], [1, 1]])
+            ((Fraction(1, 2), Fraction(0, 1)), (Fraction(-1, 2), Fraction(1, 1)))
+    """
+    return _inverse(tuple(tuple(as_fraction(x) for x in row) for row in matrix))
+
+
+@lru_cache(maxsize=256)
+def _inverse(matrix):
+    n = len(matrix)
+    rows = [
+        list(row) + [Fraction(int(i == j)) for j in range(n)]
+        for i, row in enumerate(matrix)
+    ]
+    for col in range(n):
+        pivot = next((r for r in range(col, n) if rows[r][col] != 0), None)
+        if pivot is None:
+            raise SingularMatrixError("The matrix is singular")
+        rows[col], rows[pivot] = rows[pivot], rows[col]
+        p = rows[col][col]
+        rows[col] = [x / p for x in rows[col]]
+        for r in range(n):
+            if r != col and rows[r][col] != 0:
+                k = rows[r][col]
+                rows[r] = [x - k * y for x, y in zip(rows[r], rows[col])]
+    return tuple(tuple(row[n:]) for row in rows)
+
+
+def matvec(matrix, vector):
+    """
+    Multiply `matrix` by `vector` exactly.
+
+    Returns :
+            **(tuple)** : the entries of the product as fractions
+    """
+    vector = [as_fraction(x) for x in vector]
+    return tuple(sum(a * b for a, b in zip(row, vector)) for row in matrix)
+
+
+def power(base, exponent):
+    """
+    Raise `base`, a number, an astropy quantity or an astropy unit, to an exact `exponent`.
+    Integer exponents use integer powers and half-integer ones a square root followed by an integer power,
+    so a float power is only taken for other fractions.
+    """
+    exponent = as_fraction(exponent)
+    if exponent.denominator == 1:
+        return base ** exponent.numerator
+    if exponent.denominator == 2 and isinstance(base, (int, float)):
+        return sqrt(base) ** exponent.numerator
+    if exponent.denominator == 2 and hasattr(base, "__array_ufunc__"):
+        return np.sqrt(base) ** exponent.numerator
+    return base**exponent
@@ -0,0 +1,242 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+from unitconvert._lazy import u, np
+from unitconvert.plan import get_planner
+
+#: Seconds during which concurrent requests for the same system and unit are collected into one batch.
+WINDOW = 0.002
+#: Number of values from which a batch is converted in the thread pool instead of on the event loop.
+OFFLOAD_SIZE = 2**16
+
+
+class Metrics:
+    """
+    Counters of a :class:`ConversionService`, see :meth:`summary`
+    """
+
+    __slots__ = ("started", "requests", "batches", "offloaded", "values", "errors", "latency", "max_latency")
+
+    def __init__(self):
+        self.started = perf_counter()
+        self.requests = 0
+        self.batches = 0
+        self.offloaded = 0
+        self.values = 0
+        self.errors = 0
+        self.latency = 0.0
+        self.max_latency = 0.0
+
+    def record(self, latency):
+        self.requests += 1
+        self.latency += latency
+        self.max_latency = max(self.max_latency, latency)
+
+    def summary(self):
+        """
+        Returns :
+            **(dictionary)** : the number of requests, batches, offloaded batches, converted values and failed requests,
+            the mean batch size, the mean and maximum latency in seconds and the throughput in values per second
+        """
+        elapsed = perf_counter() - self.started
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "offloaded": self.offloaded,
+            "values": self.values,
+            "errors": self.errors,
+            "mean_batch": self.requests / self.batches if self.batches else 0.0,
+            "mean_latency": self.latency / self.requests if self.requests else 0.0,
+            "max_latency": self.max_latency,
+            "throughput": self.values / elapsed if elapsed > 0 else 0.0,
+        }
+
+
+class ConversionService:
+    """
+    An asyncio front end to the conversion plans. Concurrent requests for the same system and source unit that arrive
+    within `window` seconds are concatenated and converted by a single vectorized call. Batches of at least
+    `offload_size` values are multiplied in a thread pool so that the event loop stays responsive.
+
+    Args :
+            **window (float)** : the batching window in seconds
+
+            **offload_size (int)** : the batch size from which the thread pool is used
+
+            **workers (int)** : the number of threads of the pool, defaults to the choice of `ThreadPoolExecutor`
+
+    Example :
+            >>> import asyncio
+            >>> from astropy import units as u
+            >>> from unitconvert.service import ConversionService
+            >>> async def main():
+            ...     async with ConversionService() as service:
+            ...         return await asyncio.gather(*(service.convert(i, u.m, "natural") for i in range(3)))
+            >>> asyncio.run(main())
+            [<Quantity 0. 1 / eV>, <Quantity 5067730.7161564 1 / eV>, <Quantity 10135461.43231279 1 / eV>]
+    """
+
+    def __init__(self, window=WINDOW, offload_size=OFFLOAD_SIZE, workers=None):
+        self.window = window
+        self.offload_size = offload_size
+        self.metrics = Metrics()
+        self.__workers = workers
+        self.__executor = None
+        self.__planners = {}
+        self.__pending = {}
+        self.__tasks = set()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def close(self):
+        """
+        Convert the pending batches and shut the thread pool down
+        """
+        while self.__tasks:
+            await asyncio.gather(*self.__tasks, return_exceptions=True)
+        if self.__executor is not None:
+            self.__executor.shutdown()
+            self.__executor = None
+
+    def planner(self, system):
+        """
+        The planner of `system`, built once per service, see :func:`unitconvert.plan.get_planner`
+        """
+        if system not in self.__planners:
+            self.__planners[system] = get_planner(system)
+        return self.__planners[system]
+
+    async def convert(self, values, unit, system):
+        """
+        Convert `values` given in `unit` to `system`. The request waits at most `window` seconds for others to share its batch.
+
+        Args :
+                **values (array_like or astropy quantity)** : the values which need to be converted
+
+                **unit (astropy unit)** : the unit of `values`
+
+                **system** : the target unit system, see :func:`unitconvert.plan.get_planner`
+
+        Returns :
+                **(astropy quantity)** : the converted values
+        """
+        start = perf_counter()
+        unit = u.Unit(unit)
+        if isinstance(values, u.Quantity):
+            values = values.to_value(unit)
+        values = np.asarray(values, dtype=float)
+        key = (system, unit)
+        future = asyncio.get_running_loop().create_future()
+        if key not in self.__pending:
+            self.__pending[key] = []
+            task = asyncio.create_task(self.__flush(key))
+            self.__tasks.add(task)
+            task.add_done_callback(self.__tasks.discard)
+        self.__pending[key].append((values, future))
+        try:
+            return await future
+        finally:
+            self.metrics.record(perf_counter() - start)
+
+    async def __flush(self, key):
+        await asyncio.sleep(self.window)
+        batch = self.__pending.pop(key)
+        futures = [future for _, future in batch]
+        try:
+            plan = self.planner(key[0])(key[1])
+            flat = np.concatenate([values.ravel() for values, _ in batch])
+            if flat.size >= self.offload_size:
+                if self.__executor is None:
+                    self.__executor = ThreadPoolExecutor(self.__workers)
+                loop = asyncio.get_running_loop()
+                result = await loop.run_in_executor(self.__executor, plan.apply, flat)
+                self.metrics.offloaded += 1
+            else:
+                result = plan.apply(flat)
+        except Exception as err:
+            self.metrics.errors += len(futures)
+            for future in futures:
+                if not future.done():
+                    future.set_exception(err)
+            return
+        self.metrics.batches += 1
+        self.metrics.values += flat.size
+        start = 0
+        for values, future in batch:
+            stop = start + values.size
+            if not future.done():
+                future.set_result(result[start:stop].reshape(values.shape) << plan.target)
+            start = stop
+
+
+class LocalClient:
+    """
+    A synchronous in-process client of a :class:`ConversionService` running on an event loop in a background thread.
+    Use it as a context manager, or call :meth:`close` when done.
+
+    Args :
+            **kwargs** : passed to :class:`ConversionService`
+
+    Example :
+            >>> from astropy import units as u
+            >>> from unitconvert.service import LocalClient
+            >>> with LocalClient() as client:
+            ...     client.convert([1.0, 2.0], u.m, "planck")
+            <Quantity [6.18714241e+34, 1.23742848e+35]>
+    """
+
+    def __init__(self, **kwargs):
+        self.loop = asyncio.new_event_loop()
+        self.__thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.__thread.start()
+        self.service = self.__run(self.__create(kwargs))
+
+    async def __create(self, kwargs):
+        return ConversionService(**kwargs)
+
+    def __run(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def convert(self, values, unit, system):
+        """
+        Convert `values` given in `unit` to `system` and wait for the result, see :meth:`ConversionService.convert`
+        """
+        return self.__run(self.service.convert(values, unit, system))
+
+    def convert_many(self, requests):
+        """
+        Submit the `(values, unit, system)` tuples of `requests` concurrently, so that they share batches, and return their results in order
+        """
+
+        async def gather():
+            return await asyncio.gather(*(self.service.convert(*request) for request in requests))
+
+        return self.__run(gather())
+
+    def metrics(self):
+        """
+        The metrics of the service, see :meth:`Metrics.summary`
+        """
+        return self.service.metrics.summary()
+
+    def close(self):
+        """
+        Stop the service and its event loop
+        """
+        if self.loop.is_closed():
+            return
+        self.__run(self.service.close())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.__thread.join()
+        self.loop.close()
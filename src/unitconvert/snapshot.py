@@ -0,0 +1,188 @@
+from collections import namedtuple
+from shutil import copyfile
+import astropy.units as u
+import numpy as np
+from unitconvert.gadget import gM, gL, gV, fromGadget
+from unitconvert.stream import CHUNKSIZE, iter_chunks
+
+#: Layout of the 256 byte header of a ``GADGET-2`` snapshot file.
+HEADER = np.dtype(
+    [
+        ("npart", "<i4", 6),
+        ("massarr", "<f8", 6),
+        ("time", "<f8"),
+        ("redshift", "<f8"),
+        ("flag_sfr", "<i4"),
+        ("flag_feedback", "<i4"),
+        ("npartTotal", "<u4", 6),
+        ("flag_cooling", "<i4"),
+        ("num_files", "<i4"),
+        ("BoxSize", "<f8"),
+        ("Omega0", "<f8"),
+        ("OmegaLambda", "<f8"),
+        ("HubbleParam", "<f8"),
+        ("flag_stellarage", "<i4"),
+        ("flag_metals", "<i4"),
+        ("npartTotalHighWord", "<u4", 6),
+        ("flag_entropy_instead_u", "<i4"),
+        ("fill", "V60"),
+    ]
+)
+
+#: Order of the blocks in format-1 snapshot files, which carry no block labels.
+FORMAT1_ORDER = ("POS", "VEL", "ID", "MASS", "U", "RHO", "HSML")
+
+#: Internal ``GADGET-2`` unit of each block that can be rescaled.
+BLOCK_UNITS = {
+    "POS": gL,
+    "VEL": gV,
+    "MASS": gM,
+    "U": gV**2,
+    "RHO": gM / gL**3,
+    "HSML": gL,
+}
+
+#: Units to which the blocks are converted by default.
+DEFAULT_UNITS = {
+    "POS": u.kpc,
+    "VEL": u.km / u.s,
+    "MASS": u.solMass,
+    "U": (u.km / u.s) ** 2,
+    "RHO": u.solMass / u.kpc**3,
+    "HSML": u.kpc,
+}
+
+Block = namedtuple("Block", ["name", "offset", "dtype", "shape"])
+
+
+def _marker(f):
+    data = f.read(4)
+    if len(data) < 4:
+        return None
+    return int(np.frombuffer(data, "<i4")[0])
+
+
+def _rows(name, npart, massarr):
+    if name in ("POS", "VEL", "ID"):
+        return int(npart.sum())
+    if name == "MASS":
+        return int(npart[massarr == 0].sum())
+    return int(npart[0])
+
+
+def scan_snapshot(path):
+    """
+    Read the header of a format-1 or format-2 ``GADGET-2`` snapshot file and locate its blocks.
+    Only the record markers are read, the particle data is left on disk.
+
+    Args :
+            **path (str)** : the path to the snapshot file
+
+    Returns :
+            **(tuple)** : the header as a record of :data:`HEADER`, its offset in the file, and the list of blocks
+            as `Block(name, offset, dtype, shape)`. Blocks of unknown layout have a `dtype` of None.
+    """
+    blocks = []
+    with open(path, "rb") as f:
+        size = _marker(f)
+        format2 = size == 8
+        if format2:
+            f.seek(size + 4, 1)
+            size = _marker(f)
+        if size != HEADER.itemsize:
+            raise ValueError(f"{path} is not a GADGET-2 snapshot file")
+        hoffset = f.tell()
+        header = np.frombuffer(f.read(size), HEADER)[0]
+        f.seek(4, 1)
+        npart = header["npart"]
+        massarr = header["massarr"]
+        order = iter(FORMAT1_ORDER)
+        while True:
+            size = _marker(f)
+            if size is None:
+                break
+            if format2:
+                name = f.read(4).decode("ascii").strip()
+                f.seek(8, 1)
+                size = _marker(f)
+            else:
+                name = next(order, None)
+                if name == "MASS" and _rows(name, npart, massarr) == 0:
+                    name = next(order, None)
+            offset = f.tell()
+            f.seek(size + 4, 1)
+            # The layout is only inferred for the blocks whose number of rows is known from the header
+            rows = _rows(name, npart, massarr) if name in BLOCK_UNITS or name == "ID" else 0
+            columns = 3 if name in ("POS", "VEL") else 1
+            itemsize = size // (rows * columns) if rows and size % (rows * columns) == 0 else 0
+            if itemsize not in (4, 8):
+                blocks.append(Block(name, offset, None, (size,)))
+                continue
+            kind = "u" if name == "ID" else "f"
+            shape = (rows, 3) if columns == 3 else (rows,)
+            blocks.append(Block(name, offset, np.dtype(f"<{kind}{itemsize}"), shape))
+    return header, hoffset, blocks
+
+
+def read_block(path, name):
+    """
+    Memory map the block `name` (e.g. `'POS'`) of the snapshot file at `path`, see :func:`scan_snapshot`.
+
+    Returns :
+            **(numpy.memmap)** : the read-only values of the block in internal ``GADGET-2`` units
+    """
+    _, _, blocks = scan_snapshot(path)
+    for block in blocks:
+        if block.name == name and block.dtype is not None:
+            return np.memmap(path, block.dtype, "r", block.offset, block.shape)
+    raise KeyError(f"No block {name} in {path}")
+
+
+def convert_snapshot(src, dst, units=None, chunksize=CHUNKSIZE):
+    """
+    Write a copy of the snapshot file `src` to `dst` with its POS, VEL, MASS, U, RHO and HSML blocks
+    converted from internal ``GADGET-2`` units. The mass table and the box size of the header are converted as well.
+    Blocks are rescaled in place in `dst` through memory maps, `chunksize` rows at a time, so the snapshot is never loaded as a whole.
+    Velocities are rescaled as stored, the :math:`\\sqrt{a}` factor of cosmological runs is left untouched.
+
+    Args :
+            **src (str)** : the path to the snapshot file in ``GADGET-2`` units
+
+            **dst (str)** : the path of the converted snapshot file
+
+            **units (dict)** : optional mapping of block names to target units, updating :data:`DEFAULT_UNITS`
+
+            **chunksize (int)** : number of rows rescaled at once
+
+    Returns :
+            **(dict)** : the factor by which each converted block was multiplied
+
+    Example :
+            >>> from unitconvert.snapshot import convert_snapshot
+            >>> from astropy import units as u
+            >>> factors = convert_snapshot("snapshot_000", "snapshot_000_kpc", units={"VEL": u.kpc / u.Gyr})
+    """
+    targets = dict(DEFAULT_UNITS)
+    targets.update(units or {})
+    factors = {
+        name: fromGadget(1.0 * unit, targets[name]).value
+        for name, unit in BLOCK_UNITS.items()
+    }
+    header, hoffset, blocks = scan_snapshot(src)
+    copyfile(src, dst)
+
+    header = np.memmap(dst, HEADER, "r+", hoffset, (1,))
+    header["massarr"] *= factors["MASS"]
+    header["BoxSize"] *= factors["POS"]
+    header.flush()
+
+    applied = {}
+    for block in blocks:
+        if block.name not in factors or block.dtype is None:
+            continue
+        data = np.memmap(dst, block.dtype, "r+", block.offset, block.shape)
+        for chunk in iter_chunks(data, chunksize):
+            np.multiply(chunk, factors[block.name], out=chunk)
+        data.flush()
+        applied[block.name] = factors[block.name]
+    return applied
@@ -0,0 +1,72 @@
+import astropy.units as u
+import numpy as np
+from unitconvert.plan import get_planner
+
+#: Number of rows converted at once when an array is streamed.
+CHUNKSIZE = 2**20
+
+
+def iter_chunks(array, chunksize=CHUNKSIZE):
+    """
+    Split `array` along its first axis into views of at most `chunksize` rows.
+    For a `numpy.memmap` only the rows of the current chunk are read from disk.
+    """
+    for start in range(0, len(array), chunksize):
+        yield array[start : start + chunksize]
+
+
+def convert_chunks(chunks, unit, system, out=None, chunksize=CHUNKSIZE):
+    """
+    Convert a stream of array chunks given in `unit` to `system`, holding only one chunk in memory at a time.
+
+    Args :
+            **chunks** : an iterable of arrays or quantities, or a single array or `numpy.memmap` that is split into chunks of `chunksize` rows
+
+            **unit (astropy unit)** : the unit of the values in `chunks`
+
+            **system** : the target unit system, see :func:`unitconvert.plan.get_planner`
+
+            **out (numpy array)** : optional array or `numpy.memmap` into which the converted chunks are written one after another
+
+            **chunksize (int)** : the number of rows per chunk when `chunks` is a single array
+
+    Returns :
+            **(generator)** : the converted chunks as astropy quantities. When `out` is given they are views of `out`.
+
+    Example :
+            >>> import numpy as np
+            >>> from astropy import units as u
+            >>> from unitconvert.stream import convert_chunks
+            >>> for chunk in convert_chunks(np.arange(4.0), u.kg, "geometrized", chunksize=2):
+            ...     print(chunk)
+            [0.00000000e+00 7.42616027e-28] m
+            [1.48523205e-27 2.22784808e-27] m
+    """
+    plan = get_planner(system)(unit)
+    if isinstance(chunks, np.ndarray):
+        chunks = iter_chunks(chunks, chunksize)
+    start = 0
+    for chunk in chunks:
+        if isinstance(chunk, u.Quantity):
+            chunk = chunk.to_value(plan.unit)
+        if out is None:
+            yield plan.apply(chunk) << plan.target
+        else:
+            stop = start + len(chunk)
+            yield plan.apply(chunk, out=out[start:stop]) << plan.target
+            start = stop
+
+
+def convert_into(chunks, unit, system, out, chunksize=CHUNKSIZE):
+    """
+    Convert all of `chunks` to `system` and write the result into `out`, see :func:`convert_chunks`.
+
+    Returns :
+            **(astropy quantity)** : `out` labelled with the target unit
+    """
+    plan = get_planner(system)(unit)
+    for _ in convert_chunks(chunks, unit, system, out=out, chunksize=chunksize):
+        pass
+    if isinstance(out, np.memmap):
+        out.flush()
+    return out << plan.target
@@ -1,8 +1,79 @@
-from unitconvert.getdimensions import getdim
-import astropy.units as u
+from functools import lru_cache
+from unitconvert.getdimensions import dimsignature
+from unitconvert._lazy import u
+from unitconvert.instrument import instrumented
+from unitconvert import defaults
+from unitconvert.plan import PLAN_CACHE_SIZE, ConversionPlan
+from unitconvert.rational import power
 
+#: Maximum number of target unit lists for which :func:`toSystem` keeps a :class:`TargetSystem`.
+TARGET_CACHE_SIZE = 64
 
-def toSystem(q, target):
+
+class TargetSystem:
+    """
+    A reusable conversion to a standard set of units, whose individual dimensions are similar to that of SI.
+    The map from SI base units to the target units is built once, and the return unit and scale factor of each input unit
+    are cached, so converting many quantities or arrays costs a single multiplication each.
+    Dimensions without a target unit keep the unit used by the input quantity, or the SI unit.
+    The map is never modified after creation and the cache is thread-safe, so one object can serve many threads.
+
+    Args :
+            **target (list)** : a list of astropy units or quantities that serve as the target unit system. A quantity such as `2*u.kg` is used as the scaled unit `2 kg`
+
+    Example :
+            >>> from unitconvert.unitsystem import TargetSystem
+            >>> from astropy import units as u
+            >>> astro = TargetSystem([u.kpc, u.solMass, u.yr])
+            >>> astro(1*u.pc*u.A)
+            <Quantity 0.001 A kpc>
+            >>> astro.plan(u.km / u.s)
+            <ConversionPlan km / s -> 1.022712165045695e-09 kpc / yr>
+    """
+
+    def __init__(self, target):
+        self.target = tuple(u.Unit(unit) for unit in target)
+        self.__map = {(1 * unit).si.unit: unit for unit in self.target}
+        self.__plan = lru_cache(maxsize=PLAN_CACHE_SIZE)(self.__compile)
+
+    def __repr__(self):
+        return f"<TargetSystem {', '.join(str(unit) for unit in self.target)}>"
+
+    def __compile(self, unit):
+        dims, _ = dimsignature(unit)
+        qSI = {(1 * base).si.unit: base for base in unit.bases}
+        returnUnits = u.dimensionless_unscaled
+        for base, p in zip(defaults.si, dims):
+            if p != 0:
+                returnUnits = returnUnits * power(self.__map.get(base, qSI.get(base, base)), p)
+        return ConversionPlan(unit, unit.to(returnUnits), returnUnits)
+
+    def plan(self, unit):
+        """
+        Compile the conversion of values given in `unit` to the target units. Plans are cached per input unit.
+
+        Returns :
+            **(ConversionPlan)** : a callable converting values or quantities given in `unit`
+        """
+        return self.__plan(u.Unit(unit))
+
+    def __call__(self, q, inplace=False):
+        """
+        Convert the astropy quantity or unit `q` to the target units.
+        With `inplace=True` the buffer of `q` is rescaled instead of copied.
+        """
+        if isinstance(q, u.UnitBase):
+            q = 1.0 * q
+        return self.plan(q.unit)(q, inplace=inplace)
+
+
+@lru_cache(maxsize=TARGET_CACHE_SIZE)
+def _target_system(target):
+    return TargetSystem(target)
+
+
+@instrumented
+def toSystem(q, target, inplace=False):
     """
     Convert any quantity to any standard set of units.
     Standard refers to set of units whose individual dimensions are similar to that of SI.
@@ -11,6 +82,8 @@ def toSystem(q, target):
             **q (astropy quantity)** : the quantity for which unit conversion must be done
             **system (list)** : a list of astropy quantities that serve as the target unit system
 
+            **inplace (bool)** : rescale the buffer of `q`, which must hold floats, instead of copying it. `q` is overwritten and shares its memory with the result
+
     Returns :
             **(astropy quantity)** : the input quantity `q` in target units
 
@@ -20,34 +93,8 @@ def toSystem(q, target):
             >>> toSystem(1*u.pc*u.A,[u.kpc,u.solMass,u.yr])
             <Quantity 0.001 A kpc>
     """
-    q = 1 * q
-
-    q = 1.0 * q
-    qSI = {(1 * uniT).si.unit: uniT for uniT in q.unit.bases}
-    targetSI = {(1 * uniT).si.unit: uniT for uniT in target}
-
-    q = q.si
-    dimdict = getdim(q)
-    m = dimdict[u.kg]
-    l = dimdict[u.m]
-    t = dimdict[u.s]
-    i = dimdict[u.A]
-    theta = dimdict[u.K]
-    j = dimdict[u.cd]
-    n = dimdict[u.mol]
-    ang = dimdict[u.rad]
-
-    uM = targetSI.get(u.kg, qSI.get(u.kg, u.kg))
-    uL = targetSI.get(u.m, qSI.get(u.m, u.m))
-    uT = targetSI.get(u.s, qSI.get(u.s, u.s))
-    uI = targetSI.get(u.A, qSI.get(u.A, u.A))
-    uTheta = targetSI.get(u.K, qSI.get(u.K, u.K))
-    uN = targetSI.get(u.mol, qSI.get(u.mol, u.mol))
-    uJ = targetSI.get(u.cd, qSI.get(u.cd, u.cd))
-    uAng = targetSI.get(u.rad, qSI.get(u.rad, u.rad))
-
-    returnUnits = (
-        uM**m * uL**l * uT**t * uI**i * uTheta**theta * uJ**j * uN**n * uAng**ang
-    )
-
-    return q.to(returnUnits)
+    try:
+        system = _target_system(tuple(target))
+    except TypeError:
+        system = TargetSystem(target)
+    return system(q, inplace=inplace)
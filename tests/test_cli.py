@@ -0,0 +1,53 @@
+import astropy.units as u
+import numpy as np
+import pytest
+import unitconvert.natural as nat
+from unitconvert.cli import main
+from unitconvert.unitsystem import toSystem
+
+
+def test_csv(tmp_path, capsys):
+    src = tmp_path / "in.csv"
+    src.write_text("x,name,t\n1,a,2\n3,b,4\n5,c,6\n")
+    assert main([str(src), str(tmp_path / "out.csv"), "--to", "natural", "--unit", "x=m", "--unit", "t=s", "--chunksize", "2"]) == 0
+    rows = (tmp_path / "out.csv").read_text().splitlines()
+    assert rows[0] == "x,name,t"
+    x = np.array([float(row.split(",")[0]) for row in rows[1:]])
+    assert [row.split(",")[1] for row in rows[1:]] == ["a", "b", "c"]
+    assert np.allclose(x, nat.toNatural([1.0, 3.0, 5.0] * u.m).value, rtol=1e-12)
+    assert "Converted 3 rows" in capsys.readouterr().err
+
+
+def test_npy(tmp_path):
+    records = np.zeros(7, dtype=[("pos", "f8"), ("id", "i8")])
+    records["pos"] = np.arange(7.0)
+    records["id"] = np.arange(7)
+    np.save(tmp_path / "in.npy", records)
+    main([str(tmp_path / "in.npy"), str(tmp_path / "out.npy"), "--to", "si:kpc,solMass,Gyr", "--unit", "pos=pc", "--chunksize", "3"])
+    out = np.load(tmp_path / "out.npy")
+    assert np.array_equal(out["id"], records["id"])
+    assert np.allclose(out["pos"], toSystem(np.arange(7.0) * u.pc, [u.kpc, u.solMass, u.Gyr]).value)
+
+
+def test_hdf5(tmp_path, capsys):
+    h5py = pytest.importorskip("h5py")
+    pos = np.arange(15.0).reshape(5, 3)
+    ids = np.arange(5)
+    with h5py.File(tmp_path / "in.h5", "w") as f:
+        f.attrs["code"] = "test"
+        group = f.create_group("PartType0")
+        group.attrs["count"] = 5
+        group.create_dataset("Coordinates", data=pos).attrs["unit"] = "kpc"
+        group.create_dataset("ParticleIDs", data=ids)
+        f.create_dataset("Time", data=2.0).attrs["unit"] = "Gyr"
+    main([str(tmp_path / "in.h5"), str(tmp_path / "out.h5"), "--to", "si:pc,solMass,yr", "--chunksize", "2"])
+    with h5py.File(tmp_path / "out.h5", "r") as f:
+        assert f.attrs["code"] == "test" and f["PartType0"].attrs["count"] == 5
+        coords = f["PartType0/Coordinates"]
+        assert np.allclose(coords[()], pos * 1e3, rtol=1e-12)
+        assert u.Unit(coords.attrs["unit"]) == u.pc
+        assert np.array_equal(f["PartType0/ParticleIDs"][()], ids)
+        assert f["PartType0/ParticleIDs"].dtype == ids.dtype
+        assert "unit" not in f["PartType0/ParticleIDs"].attrs
+        assert np.isclose(f["Time"][()], 2e9) and u.Unit(f["Time"].attrs["unit"]) == u.yr
+    assert "PartType0/Coordinates: pc" in capsys.readouterr().out
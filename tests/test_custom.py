@@ -1,7 +1,8 @@
-from unitconvert.custom import create_units, load_units
+from unitconvert.custom import checksystem, checksystems, create_units, load_units
 from astropy import constants as ac
 from astropy import units as u
 import numpy as np
+import pytest
 
 
 def test1_2C_1U():
@@ -43,3 +44,116 @@ def test_1C_1U():
     )
     to, fr, fac, mat = load_units(name=name, save="local")
     assert np.isclose(to(u.m * u.A), 5067730.7 * hbar * u.A / u.eV)
+
+
+def test_unitsystem_table():
+    from unitconvert.custom import UnitSystem
+    from astropy.table import QTable
+
+    system = UnitSystem({"constants": [ac.c, ac.hbar], "units": [u.eV]})
+    table = QTable({"x": [1.0, 2.0] * u.m, "t": [3.0, 4.0] * u.s, "id": [7, 8]})
+    res = system.from_another_table(table)
+    assert np.allclose(res["x"], system.from_another(table["x"]))
+    assert np.allclose(res["t"], system.from_another(table["t"]))
+    assert res["id"][0] == 7
+
+
+def test_legacy_format(tmp_path, monkeypatch):
+    from unitconvert.custom import checksystem
+
+    monkeypatch.chdir(tmp_path)
+    details = checksystem([ac.c, ac.hbar, u.eV])
+    with open(".unit_legacy.dat", "w") as f:
+        f.write("#constants \n['c', 'hbar']\n#units \n['eV', 'K', 'A', 'mol', 'cd', 'rad']\n")
+        f.write("#symbols for constants \n['c', 'hbar']\n")
+        f.write("#si-basis \n['kg', 'm', 's', 'K', 'A', 'mol', 'cd', 'rad']\n")
+    np.savetxt(".unitlegacy.mat", details["Matrix-U_SI"])
+
+    to, fr, fac, mat = load_units(name="legacy", save="local")
+    assert np.isclose(to(u.m * u.cd), 5067730.7 * u.cd / u.eV)
+
+
+def test_npz_exact(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    create_units([ac.G, ac.c], [u.kg], save="local", name="npz", overwrite="yes")
+    with np.load(".unit_npz.npz", allow_pickle=False) as data:
+        assert data["constant_values"][0] == ac.G.value
+    to, fr, fac, mat = load_units(name="npz", save="local")
+    assert np.isclose(fr(to(u.solMass), u.kg), 1 * u.solMass)
+
+
+def test_registry(tmp_path, monkeypatch):
+    from unitconvert.custom import clear_registry, preload_units
+
+    monkeypatch.chdir(tmp_path)
+    create_units([ac.c, ac.hbar], [u.eV], save="local", name="reg", overwrite="yes")
+    assert preload_units(save="local") == ["reg"]
+    first = load_units(name="reg", save="local")
+    assert load_units(name="reg", save="local") is first
+    assert load_units(name="reg", save="local", cache=False) is not first
+    clear_registry("reg")
+    assert load_units(name="reg", save="local") is not first
+
+
+def test_factor_cache():
+    to, fr, fac, mat = create_units([ac.c, ac.hbar], [u.eV])
+    to.cache_clear()
+    first = to(1 * u.m)
+    assert np.allclose(to([2.0, 3.0] * u.m), [2.0, 3.0] * first)
+    assert fr.cache_info().hits == 1
+    assert fac(u.m) == fac(2 * u.m)
+
+
+def test_unitsystem_lookup(capsys):
+    from unitconvert.custom import UnitSystem
+
+    system = UnitSystem({"constants": [ac.G, ac.c], "units": [u.kg]})
+    assert capsys.readouterr().out == ""
+    to, fr, fac, mat = create_units([ac.G, ac.c], [u.kg], verbose=False)
+    for q in [1 * u.m, [1.0, 2.0] * u.J, 3 * u.A * u.s, 2 * u.m**5]:
+        assert np.allclose(system.from_another(q), to(q))
+        assert np.allclose(system.to_another(system.from_another(q), q.unit), q)
+    assert system.from_another(3.0) == 3.0 * u.dimensionless_unscaled
+    assert system.from_another_value(3.0) == 3.0
+    assert system.to_another(3.0, u.dimensionless_unscaled) == 3.0 * u.dimensionless_unscaled
+
+
+def test_checksystems(capsys):
+    specs = [
+        [ac.c, ac.hbar, u.eV],
+        [ac.c, u.m / u.s],
+        [ac.c],
+        {"constants": [ac.G, ac.c], "units": [u.kg]},
+    ]
+    res = checksystems(specs)
+    assert [r["valid"] for r in res] == [True, False, False, True]
+    assert [r["singular"] for r in res] == [False, True, False, False]
+    assert res[2]["Matrix-SI_U"] is None and res[2]["error"]
+    expected = checksystem([ac.c, ac.hbar, u.eV], verbose=False)["Matrix-U_SI"]
+    assert np.allclose(res[0]["Matrix-U_SI"], expected)
+    assert capsys.readouterr().out == ""
+
+
+def test_checksystem_mismatch():
+    with pytest.raises(ValueError):
+        checksystem([ac.c], verbose=False)
+    res = checksystems([[ac.c, ac.hbar, u.eV], [ac.c]])
+    assert [r["valid"] for r in res] == [True, False]
+
+
+def test_threads(tmp_path, monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+    from unitconvert.custom import UnitSystem
+
+    monkeypatch.chdir(tmp_path)
+    create_units([ac.c, ac.G], [u.kpc, u.K, u.A], save="local", name="thr", overwrite="yes", verbose=False)
+    system = UnitSystem({"constants": [ac.c, ac.G], "units": [u.kpc, u.K, u.A]})
+    quantities = [np.arange(1.0, 5.0) * unit for unit in [u.m, u.J, u.m**5 / u.s, u.W / u.A**2, u.kg**4]]
+    with ThreadPoolExecutor(8) as pool:
+        loaded = list(pool.map(lambda _: load_units(name="thr", save="local"), range(16)))
+        converted = list(pool.map(lambda i: system.from_another(quantities[i % 5]), range(40)))
+    assert all(i[0] is loaded[0][0] for i in loaded)
+    to = loaded[0][0]
+    for i, res in enumerate(converted):
+        assert res.unit == to(quantities[i % 5]).unit
+        assert np.allclose(res.value, to(quantities[i % 5]).value)
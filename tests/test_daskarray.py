@@ -0,0 +1,27 @@
+import astropy.units as u
+import numpy as np
+import pytest
+import unitconvert.natural as nat
+import unitconvert.gadget as gad
+from unitconvert.daskarray import LazyQuantity, convert_dask
+
+da = pytest.importorskip("dask.array")
+
+
+def test_convert_dask_is_lazy():
+    values = np.linspace(1.0, 2.0, 1000)
+    array = da.from_array(values, chunks=100)
+    res = convert_dask(array, u.m, "natural")
+    assert isinstance(res, LazyQuantity)
+    assert isinstance(res.value, da.Array)
+    assert res.value.numblocks == array.numblocks
+    assert np.allclose(res.compute(), nat.toNatural(values * u.m), rtol=1e-12)
+
+
+def test_converters_accept_lazy_quantities():
+    values = np.linspace(1.0, 2.0, 1000)
+    q = LazyQuantity(da.from_array(values, chunks=250), u.km)
+    res = nat.toNatural(q)
+    assert isinstance(res, LazyQuantity)
+    assert np.allclose(nat.fromNatural(res, u.m).compute(), values * u.km, rtol=1e-12)
+    assert np.allclose(gad.toGadget(q).compute(), gad.toGadget(values * u.km), rtol=1e-12)
@@ -5,6 +5,7 @@ import unitconvert.gaussian as gau
 import unitconvert.geometrized as geo
 import astropy.constants as c
 import numpy as np
+import pytest
 
 
 def test_nat():
@@ -29,3 +30,181 @@ def test_gau():
 
 def test_planck():
     assert np.isclose(pl.toPlanck(u.m) ** -1, 1.616255e-35, rtol=1e-6)
+
+
+def test_dimsignature_cache():
+    from unitconvert.getdimensions import dimsignature, cache_info
+
+    assert dimsignature(u.km / u.s) == ((0, 1, -1, 0, 0, 0, 0, 0), 1000.0)
+    hits = cache_info().hits
+    dimsignature(3 * u.km / u.s)
+    assert cache_info().hits == hits + 1
+
+
+def test_plan():
+    p = nat.plan(u.m)
+    assert p is nat.plan("m")
+    values = np.array([1.0, 2.0, 3.0])
+    res = p(values)
+    assert np.allclose(res, nat.toNatural(values * u.m), rtol=1e-12)
+    assert np.isclose(p(1 * u.km), nat.toNatural(1 * u.km), rtol=1e-12)
+    assert np.isclose(geo.plan(u.solMass)(1.0), geo.toGeometrized(u.solMass))
+
+
+def test_values_out():
+    values = np.linspace(1.0, 2.0, 5)
+    expected = pl.toPlanck(values * u.m).value
+    out = np.empty_like(values)
+    res = pl.toPlanckValues(values, u.m, out=out)
+    assert res is out
+    assert np.allclose(out, expected, rtol=1e-12)
+    gau.toGaussianValues(values, u.A, out=values)
+    assert np.allclose(values, gau.toGaussian(np.linspace(1.0, 2.0, 5) * u.A).value)
+
+
+def test_lazy_import():
+    import subprocess
+    import sys
+    import unitconvert.constants as uc
+
+    code = "import sys, unitconvert.natural, unitconvert.custom; print('astropy' in sys.modules)"
+    res = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    assert res.stdout.strip() == "False"
+    for name in ["c", "hbar", "G", "k_B", "eps0"]:
+        assert np.isclose(getattr(uc, name), getattr(c, name).si.value, rtol=1e-8)
+
+
+def test_star_import():
+    import subprocess
+    import sys
+
+    code = (
+        "import sys, unitconvert.gadget; lazy = 'astropy' not in sys.modules\n"
+        "from unitconvert.gadget import *\n"
+        "from unitconvert.defaults import *\n"
+        "print(lazy, gL, gM, gV, gT, len(si), callable(toGadget))"
+    )
+    res = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    assert res.stdout.split() == ["True", "gL", "gM", "gV", "gT", "8", "True"], res.stderr
+
+
+def test_rational_exponents():
+    from fractions import Fraction
+    from unitconvert.rational import inverse
+
+    assert inverse([[2, 1], [0, 3]]) == ((Fraction(1, 2), Fraction(-1, 6)), (0, Fraction(1, 3)))
+    assert nat.factorNatural(u.A) == {"hbar": -0.5, "c": 0.5, "k_B": 0.0, "eps0": 0.5}
+    assert np.isclose(pl.fromPlanck(pl.toPlanck(1 * u.V), u.V), 1 * u.V)
+
+
+def test_compiled_systems():
+    from unitconvert.compiler import ATOMIC, STONEY, CompiledSystem
+
+    assert np.isclose(ATOMIC.convert(c.c), 1 / c.alpha)
+    assert np.isclose(ATOMIC.convert(c.a0), 1)
+    assert np.isclose(STONEY.convert(c.e.si), 1)
+    assert np.isclose(ATOMIC.convertback(ATOMIC.convert(3 * u.eV), u.eV), 3 * u.eV)
+    assert nat.NATURAL.plan(u.m) is nat.plan(u.m)
+    with pytest.raises(ValueError):
+        CompiledSystem("broken", {"c": "c"}, ["m"])
+
+
+def test_target_system():
+    from unitconvert.unitsystem import TargetSystem, toSystem
+
+    astro = TargetSystem([u.kpc, u.solMass, u.yr])
+    values = np.linspace(1.0, 2.0, 4)
+    res = astro(values * u.km / u.s)
+    assert res.unit == u.kpc / u.yr
+    assert np.allclose(res, values * u.km / u.s, rtol=1e-12)
+    assert astro.plan(u.km / u.s) is astro.plan("km / s")
+    assert toSystem(1 * u.pc * u.A, [u.kpc, u.solMass, u.yr]).unit == u.A * u.kpc
+    assert np.isclose(toSystem(2 * u.J, [u.cm, u.g, u.s]), 2e7 * u.erg)
+    res = toSystem(3 * u.kg, [u.pc, 2 * u.kg])
+    assert res.value == 1.5 and res.unit == u.Unit(2 * u.kg)
+
+
+def test_dimension():
+    from unitconvert.getdimensions import Dimension, getdim
+
+    speed = getdim(u.km / u.s)
+    assert isinstance(speed, Dimension)
+    assert speed == (0, 1, -1, 0, 0, 0, 0, 0)
+    assert speed[u.m] == 1 and speed[u.kg] == 0
+    assert speed[np.int64(1)] == 1 and speed[np.int32(2)] == -1
+    assert speed + getdim(u.s) == getdim(u.m)
+    assert 2 * speed - speed == speed
+    assert {speed: "speed"}[getdim(u.m / u.s)] == "speed"
+    with pytest.raises(ValueError):
+        Dimension((1, 2))
+
+
+def test_reverse_converter():
+    to_m = nat.reverse_converter(u.m)
+    values = nat.toNatural(np.linspace(1.0, 2.0, 5) * u.m)
+    assert np.allclose(to_m(values), np.linspace(1.0, 2.0, 5) * u.m, rtol=1e-12)
+    assert np.allclose(to_m(values.value), np.linspace(1.0, 2.0, 5) * u.m, rtol=1e-12)
+    assert np.isclose(pl.reverse_converter(u.V)(pl.toPlanck(1 * u.V)), 1 * u.V)
+    assert np.isclose(gau.reverse_converter(u.A)(gau.toGaussian(3 * u.A)), 3 * u.A)
+    with pytest.raises(u.UnitConversionError):
+        to_m(1 * u.eV)
+
+
+def test_inplace_memory():
+    import tracemalloc
+    from unitconvert.unitsystem import toSystem
+
+    x = np.linspace(1.0, 2.0, 10**6) * u.km
+    expected = nat.toNatural(x)
+    buffer = x.view(np.ndarray)
+    tracemalloc.start()
+    res = nat.toNatural(x, inplace=True)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    assert peak < 0.05 * x.nbytes
+    assert np.shares_memory(res, buffer)
+    assert res.unit == expected.unit
+    assert np.allclose(res.value, expected.value, rtol=1e-12)
+    back = nat.fromNatural(res, u.km, inplace=True)
+    assert np.shares_memory(back, buffer)
+    assert np.allclose(back.value, np.linspace(1.0, 2.0, 10**6))
+    res = toSystem(back, [u.pc], inplace=True)
+    assert np.shares_memory(res, buffer) and res.unit == u.pc
+
+
+def test_inplace_refused():
+    from unitconvert.custom import UnitSystem
+    from unitconvert.unitsystem import toSystem
+
+    system = UnitSystem({"constants": [c.G, c.c], "units": [u.kg]})
+    hbar = c.hbar.value
+    for convert in (nat.toNatural, system.from_another, lambda q, inplace: toSystem(q, [u.pc], inplace)):
+        with pytest.raises(TypeError):
+            convert(c.hbar, inplace=True)
+    assert c.hbar.value == hbar
+    x = np.linspace(1.0, 2.0, 4)
+    x.flags.writeable = False
+    with pytest.raises(TypeError):
+        nat.toNatural(u.Quantity(x, u.m, copy=False), inplace=True)
+    with pytest.raises(TypeError):
+        nat.plan(u.m)(x, inplace=True)
+    for q, unit in ((c.hbar, u.J * u.s), (u.Quantity(x, 1 / u.eV, copy=False), u.m)):
+        for convert in (nat.fromNatural, pl.fromPlanck):
+            with pytest.raises(TypeError):
+                convert(q, unit, inplace=True)
+    assert c.hbar.value == hbar
+    assert nat.fromNatural(1 * u.m, u.kg) == "Cannot convert"
+
+
+def test_gadget_arrays():
+    import unitconvert.gadget as gad
+
+    x = np.linspace(1.0, 2.0, 4) * gad.gL
+    for final in (None, u.pc):
+        res = gad.fromGadget(x, final)
+        expected = [gad.fromGadget(i, final) for i in x]
+        assert res.unit == expected[0].unit
+        assert np.allclose(res.value, [i.value for i in expected], rtol=1e-14)
+    hits = gad._reverse_plan.cache_info().hits
+    gad.fromGadget(x, "pc")
+    assert gad._reverse_plan.cache_info().hits == hits + 1
@@ -0,0 +1,42 @@
+import json
+import pstats
+import astropy.units as u
+import numpy as np
+import unitconvert.natural as nat
+from unitconvert import instrument
+
+
+def test_profile(tmp_path):
+    nat.toNatural(1 * u.m)
+    assert not instrument.is_enabled()
+    with instrument.profile():
+        for i in range(10):
+            nat.toNatural(np.ones(5) * u.m)
+        nat.fromNatural(1 / u.eV, u.m)
+    assert not instrument.is_enabled()
+    nat.toNatural(1 * u.m)
+    data = instrument.report()
+    assert data["functions"]["natural.toNatural"]["calls"] == 10
+    assert data["functions"]["natural.toNatural"]["values"] == 50
+    assert data["caches"]["natural.plan"]["hit_rate"] > 0.9
+    instrument.dump_json(tmp_path / "report.json")
+    assert json.loads((tmp_path / "report.json").read_text())["functions"].keys() == data["functions"].keys()
+    instrument.dump_stats(tmp_path / "report.prof")
+    assert pstats.Stats(str(tmp_path / "report.prof")).total_calls == 11
+
+
+def test_custom_caches():
+    from astropy import constants as ac
+    from unitconvert.custom import UnitSystem, create_units
+
+    to, fr, fac, mat = create_units([ac.c, ac.hbar], [u.eV], name="inst", verbose=False)
+    system = UnitSystem({"constants": [ac.G, ac.c], "units": [u.kg]})
+    with instrument.profile():
+        for i in range(10):
+            to(i * u.m)
+            system.from_another(i * u.m)
+        system.from_another(1 * u.mol)
+    caches = instrument.report()["caches"]
+    assert caches["custom.inst"] == {"hits": 9, "misses": 1, "hit_rate": 0.9}
+    assert caches["custom.UnitSystem"]["hits"] == 10
+    assert caches["custom.UnitSystem"]["misses"] == 1
@@ -0,0 +1,23 @@
+import astropy.units as u
+import numpy as np
+import unitconvert.natural as nat
+from unitconvert.gadget import toGadget
+from unitconvert.parallel import convert_array, convert_files
+
+
+def test_convert_array():
+    values = np.arange(1000.0).reshape(250, 4)
+    res = convert_array(values * u.km, u.km, "natural", workers=2)
+    assert res.shape == values.shape
+    assert np.allclose(res, nat.toNatural(values * u.km), rtol=1e-12)
+
+
+def test_convert_files(tmp_path):
+    (tmp_path / "out").mkdir()
+    paths = []
+    for i in range(3):
+        paths.append(str(tmp_path / f"part{i}.npy"))
+        np.save(paths[-1], np.full(10, i, dtype="f4"))
+    written, unit = convert_files(paths, u.pc, toGadget, tmp_path / "out", workers=2, chunksize=4)
+    assert unit == toGadget(1 * u.pc).unit
+    assert np.allclose(np.load(written[2]) * unit, toGadget(np.full(10, 2.0) * u.pc))
@@ -0,0 +1,32 @@
+import asyncio
+import astropy.units as u
+import numpy as np
+import pytest
+import unitconvert.natural as nat
+import unitconvert.gadget as gad
+from unitconvert.service import ConversionService, LocalClient
+
+
+def test_batching():
+    async def main():
+        async with ConversionService(window=0.01) as service:
+            res = await asyncio.gather(*(service.convert(float(i), u.m, "natural") for i in range(50)))
+            return res, service.metrics.summary()
+
+    res, metrics = asyncio.run(main())
+    assert np.allclose(u.Quantity(res), nat.toNatural(np.arange(50.0) * u.m), rtol=1e-12)
+    assert metrics["requests"] == 50
+    assert metrics["batches"] == 1
+
+
+def test_local_client():
+    values = np.arange(12.0).reshape(3, 4)
+    with LocalClient(offload_size=10) as client:
+        res = client.convert_many([(values, u.kpc, "gadget"), (1.0, u.A, "gaussian")])
+        assert res[0].shape == (3, 4)
+        assert np.allclose(res[0], gad.toGadget(values * u.kpc), rtol=1e-12)
+        with pytest.raises(ValueError):
+            client.convert(1.0, u.m, "unknown")
+        metrics = client.metrics()
+    assert metrics["offloaded"] == 1
+    assert metrics["errors"] == 1
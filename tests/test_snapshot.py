@@ -0,0 +1,74 @@
+import astropy.units as u
+import numpy as np
+import pytest
+from unitconvert.gadget import gL, gM, gV
+from unitconvert.snapshot import HEADER, convert_snapshot, read_block, scan_snapshot
+
+
+def write_snapshot(path, blocks, npart, massarr, format2=False):
+    header = np.zeros(1, HEADER)
+    header["npart"] = npart
+    header["massarr"] = massarr
+    header["BoxSize"] = 100.0
+    records = [("HEAD", header.tobytes())] + [(n, b.tobytes()) for n, b in blocks]
+    with open(path, "wb") as f:
+        for name, data in records:
+            if format2:
+                label = name.ljust(4).encode() + np.int32(len(data) + 8).tobytes()
+                f.write(np.int32(8).tobytes() + label + np.int32(8).tobytes())
+            marker = np.int32(len(data)).tobytes()
+            f.write(marker + data + marker)
+
+
+@pytest.mark.parametrize("format2", [False, True])
+def test_convert_snapshot(tmp_path, format2):
+    npart = [2, 3, 0, 0, 0, 0]
+    massarr = [0.0, 0.5, 0, 0, 0, 0]
+    pos = np.arange(15, dtype="f4").reshape(5, 3)
+    blocks = [
+        ("POS", pos),
+        ("VEL", pos + 1),
+        ("ID", np.arange(5, dtype="u4")),
+        ("MASS", np.array([1.0, 2.0], dtype="f4")),
+        ("U", np.array([3.0, 4.0], dtype="f4")),
+        ("RHO", np.array([5.0, 6.0], dtype="f4")),
+    ]
+    src, dst = tmp_path / "snap", tmp_path / "snap_conv"
+    write_snapshot(src, blocks, npart, massarr, format2)
+
+    factors = convert_snapshot(src, dst, chunksize=2)
+    assert set(factors) == {"POS", "VEL", "MASS", "U", "RHO"}
+    assert np.allclose(read_block(dst, "POS"), (pos * gL).to_value(u.kpc))
+    assert np.allclose(read_block(dst, "VEL"), ((pos + 1) * gV).to_value(u.km / u.s))
+    assert np.allclose(read_block(dst, "MASS"), ([1.0, 2.0] * gM).to_value(u.solMass))
+    assert np.array_equal(read_block(dst, "ID"), np.arange(5))
+    header, _, _ = scan_snapshot(dst)
+    assert np.isclose(header["massarr"][1], (0.5 * gM).to_value(u.solMass))
+    assert np.isclose(header["BoxSize"], 100.0 * gL.to(u.kpc))
+
+
+def test_extra_blocks(tmp_path):
+    npart = [2, 4, 0, 0, 0, 0]
+    pos = np.arange(18, dtype="f4").reshape(6, 3)
+    blocks = [
+        ("POS", pos),
+        ("VEL", pos),
+        ("ID", np.arange(6, dtype="u8")),
+        ("MASS", np.arange(6, dtype="f4")),
+        ("U", np.array([3.0, 4.0], dtype="f4")),
+        ("POT", np.arange(6, dtype="f4")),
+        ("ACCE", np.arange(18, dtype="f4")),
+    ]
+    src, dst = tmp_path / "snap", tmp_path / "snap_conv"
+    write_snapshot(src, blocks, npart, [0] * 6, format2=True)
+
+    _, _, found = scan_snapshot(src)
+    layout = {block.name: (block.dtype, block.shape) for block in found}
+    assert layout["ID"] == (np.dtype("<u8"), (6,))
+    assert layout["POT"] == (None, (24,))
+    assert layout["ACCE"] == (None, (72,))
+    factors = convert_snapshot(src, dst)
+    assert set(factors) == {"POS", "VEL", "MASS", "U"}
+    assert np.allclose(read_block(dst, "U"), ([3.0, 4.0] * gV**2).to_value((u.km / u.s) ** 2))
+    with pytest.raises(KeyError):
+        read_block(dst, "POT")
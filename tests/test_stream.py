@@ -0,0 +1,23 @@
+import astropy.units as u
+import astropy.constants as c
+import numpy as np
+import unitconvert.natural as nat
+from unitconvert.custom import UnitSystem
+from unitconvert.stream import convert_chunks, convert_into
+
+
+def test_memmap(tmp_path):
+    src = np.lib.format.open_memmap(tmp_path / "src.npy", mode="w+", shape=(10,))
+    src[:] = np.arange(10.0)
+    out = np.lib.format.open_memmap(tmp_path / "out.npy", mode="w+", shape=(10,))
+    res = convert_into(src, u.m, "natural", out=out, chunksize=3)
+    assert res.unit == nat.plan(u.m).target
+    assert np.allclose(np.load(tmp_path / "out.npy"), nat.toNatural(np.arange(10.0) * u.m).value)
+
+
+def test_custom_generator():
+    system = UnitSystem({"constants": [c.c, c.hbar], "units": [u.eV]})
+    chunks = (np.full(4, i) * u.km for i in range(3))
+    res = list(convert_chunks(chunks, u.km, system))
+    assert len(res) == 3
+    assert np.allclose(res[2], system.from_another(np.full(4, 2.0) * u.km))